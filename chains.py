@@ -0,0 +1,186 @@
+"""
+Monte Carlo of the animatronics' movement chains, with NumPy.
+Each animatronic's `movements` table in data/game/animatronics.json is a Markov chain over its locations. This runs
+millions of independent walks of each chain at once, with the game's movement rule (every movement timer,
+randint(1, 20) <= aggression moves it to a random entry of its row) and the aggression changes nights.json makes
+each hour, and reports when each one first reaches its door. It takes seconds where simulate.py takes hours.
+
+    python chains.py --nights=1,2,3 --runs=1000000
+    python chains.py --nights-file=my_nights.json --json=chains.json
+
+Other options: --seed=N and --chunk=N, how many walks are held in memory at once.
+
+What it leaves out is everything the player and the other animatronics do: doors, cameras holding Lefty,
+Chica and Lefty blocking each other at the door, the power running out. The Knight's walk ends when he is
+primed to run. So it is the pressure a night puts on a player who does nothing, which simulate.py can then check.
+Animatronics whose table has no door location (Garble only ever circles the cameras) are left out.
+"""
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from data.game.timing import HOURS, HOUR_NAMES, HOUR_DURATION, MOVEMENT_TIMERS, clock_time
+
+HOUR_LENGTH = HOUR_DURATION * 1000
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class Chain:
+    """One animatronic's movement table as arrays, with the night's movement opportunities and their aggression."""
+    def __init__(self, name: str, data: dict, night: dict):
+        self.name = name
+        movements = data['movements']
+        self.door = len(data['cameras'])
+        self.lengths = np.array([len(row) for row in movements], dtype=np.intp)
+        # Rows padded to the longest one, the padding is never picked
+        self.moves = np.zeros((len(movements), self.lengths.max()), dtype=np.intp)
+        for i, row in enumerate(movements):
+            self.moves[i, :len(row)] = row
+
+        self.interval = MOVEMENT_TIMERS[name]
+        self.times = np.arange(self.interval, HOURS * HOUR_LENGTH, self.interval)
+        self.hourly = aggression(night['difficulty'], night['change'])
+        self.aggression = np.array([self.hourly[time // HOUR_LENGTH] for time in self.times])
+
+    def walk(self, runs: int, rng: 'np.random.Generator') -> 'np.ndarray':
+        """
+        Walks runs chains from location 0 through the night. Returns how many reached the door at each
+        movement opportunity, with the ones that never did last.
+        """
+        arrivals = np.zeros(len(self.times) + 1, dtype=np.int64)
+        # Only the walks still going are kept, so a night that is over for most of them gets cheap
+        location = np.zeros(runs, dtype=np.intp)
+        for step, aggression in enumerate(self.aggression):
+            if not location.size:
+                break
+            if aggression == 0:
+                continue
+            moving = np.flatnonzero(rng.integers(1, 21, size=location.size) <= aggression)
+            here = location[moving]
+            picks = rng.integers(0, self.lengths[here])
+            location[moving] = self.moves[here, picks]
+            arrived = location == self.door
+            count = np.count_nonzero(arrived)
+            if count:
+                arrivals[step] = count
+                location = location[~arrived]
+        arrivals[-1] = location.size
+        return arrivals
+
+
+def has_door(data: dict) -> bool:
+    """Whether any move in the table leads to the door, the location after the last camera."""
+    return any(len(data['cameras']) in row for row in data['movements'])
+
+
+def aggression(difficulty: int, changes: list[list[int]]) -> list[int]:
+    """The aggression for each hour, changed the way Game.hour_changed does it: the first change for an hour counts."""
+    levels = [difficulty]
+    for hour in range(1, HOURS):
+        level = levels[-1]
+        for change in changes:
+            if change[0] == hour:
+                level = max(min(level + change[1], 20), 0)
+                break
+        levels.append(level)
+    return levels
+
+
+def run(nights: list[int], runs: int, seed: int = 0, chunk: int = 1 << 20,
+        nights_file: str = 'data/game/nights.json') -> list[dict]:
+    with open('data/game/animatronics.json', 'r') as f:
+        animatronics = json.load(f)
+    with open(nights_file, 'r') as f:
+        night_dict = json.load(f)
+    results = []
+    for night in nights:
+        for name, night_data in night_dict[str(night)]['animatronics'].items():
+            if not has_door(animatronics[name]):
+                continue
+            chain = Chain(name, animatronics[name], night_data)
+            # One stream per night and animatronic, so adding either leaves the others' results alone
+            rng = np.random.default_rng([seed, night, list(MOVEMENT_TIMERS).index(name)])
+            arrivals = np.zeros(len(chain.times) + 1, dtype=np.int64)
+            for start in range(0, runs, chunk):
+                arrivals += chain.walk(min(chunk, runs - start), rng)
+            results.append({'night': night, 'animatronic': name, 'runs': runs, 'interval': chain.interval,
+                            'aggression': chain.hourly,
+                            'times': chain.times.tolist(), 'arrivals': arrivals.tolist()})
+    return results
+
+
+def percentile(times: list[int], arrivals: list[int], runs: int, q: float) -> int | None:
+    """The time by which q percent of all the runs had reached the door, None if that many never did."""
+    needed = runs * q / 100
+    total = 0
+    for time, count in zip(times, arrivals):
+        total += count
+        if total >= needed:
+            return time
+    return None
+
+
+def report(results: list[dict]) -> str:
+    lines = []
+    for night in sorted({result['night'] for result in results}):
+        lines.append(f"Night {night}: {results[0]['runs']} runs per animatronic")
+        lines.append("  animatronic  at door" + ''.join(f"{f'p{q}':>9}" for q in PERCENTILES)
+                     + ''.join(f"{name:>7}" for name in HOUR_NAMES))
+        for result in results:
+            if result['night'] != night:
+                continue
+            runs = result['runs']
+            arrivals = result['arrivals'][:-1]
+            reached = sum(arrivals)
+            times = [percentile(result['times'], arrivals, runs, q) for q in PERCENTILES]
+            hours = [0] * HOURS
+            for time, count in zip(result['times'], arrivals):
+                hours[time // HOUR_LENGTH] += count
+            lines.append(f"  {result['animatronic']:<12}{reached / runs:8.1%}"
+                         + ''.join(f"{'-' if time is None else clock_time(time, HOUR_LENGTH):>9}" for time in times)
+                         + ''.join(f"{count / runs:7.1%}" for count in hours))
+    return '\n'.join(lines)
+
+
+def main():
+    nights = [1, 2, 3, 4, 5]
+    runs = 1000000
+    seed = 0
+    chunk = 1 << 20
+    nights_file = 'data/game/nights.json'
+    output = None
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition('=')
+        if name == '--nights':
+            nights = [int(night) for night in value.split(',')]
+        elif name == '--runs':
+            runs = int(value)
+        elif name == '--seed':
+            seed = int(value)
+        elif name == '--chunk':
+            chunk = int(value)
+        elif name == '--nights-file':
+            nights_file = value
+        elif name == '--json':
+            output = value
+        else:
+            sys.exit(f"Unknown option {arg}, see the top of chains.py")
+    if np is None:
+        sys.exit("chains.py needs NumPy: pip install numpy")
+
+    start = time.perf_counter()
+    results = run(nights, runs, seed, chunk, nights_file)
+    print(report(results))
+    print(f"{len(results)} chains of {runs} runs in {time.perf_counter() - start:.1f}s")
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(results, f)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+"""
+How long a night is and how often each animatronic gets a chance to move.
+Kept apart from constants.py, which needs pygame, so tools like chains.py can read them without starting SDL.
+"""
+HOURS = 6
+HOUR_NAMES = ['12 AM', '1 AM', '2 AM', '3 AM', '4 AM', '5 AM']
+# Seconds each in-game hour lasts
+HOUR_DURATION = 60
+# Milliseconds between each animatronic's movement opportunities
+MOVEMENT_TIMERS = {'Bonnie': 4970, 'Chica': 4980, 'Lefty': 3020, 'Knight': 5010, 'Garble': 5010}
+
+
+def clock_time(millis: int, hour_length: int = HOUR_DURATION * 1000) -> str:
+    hour, minutes = divmod(int(millis) * 60 // hour_length, 60)
+    return f"{(hour - 1) % 12 + 1}:{minutes:02d} AM"
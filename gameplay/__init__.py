@@ -8,9 +8,20 @@ from .systems import (
     Vents
 )
 from .buttons import *
+from .animation import Animator, StaticGenerator
 from .animatronics import *
 from .office import *
 from .game import *
 from .menu import *
 from .clock import Clock
 from .power import PowerManager
+from .assets import AssetLoader, AssetCache, SpriteResidency, TextCache, collect_assets, loader, cache, sprites, texts
+from .pack import AssetPack, build_pack
+from .atlas import TextureAtlas
+from .scaled import ScaledCache, scaled
+from .audio import Bus, Mixer, MusicStream, mixer, LOW, NORMAL, HIGH, CRITICAL
+from .transition import Transition, Transitions, transitions
+from .resolution import LOGICAL_SIZE, Resolution, resolution, logical, logical_pos, logical_rect, logical_font
+from .backend import TextureBackend, texture_backend, composited, changed, draw_rect
+from .scheduler import Scheduler, WallClock, PausableClock, VirtualClock, scheduler
+from .bus import EventBus
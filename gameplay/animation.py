@@ -1,9 +1,28 @@
 import time
 
+import os
+import random
+
 import pygame
+from .assets import cache
+from .scheduler import scheduler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Animator:
+    """
+    Plays a vertical sprite sheet of image_rect sized frames.
+    The frame shown comes from the scheduler's time since the animation started, speed being frames per
+    tick at FRAME_RATE ticks a second, so it plays just as fast no matter how often it is drawn.
+    Frames are cut out of the sheet (and scaled to the screen with scale_to_fit) the first time
+    they are shown and kept until it stops playing, so every draw after that is a single blit.
+    """
+    FRAME_RATE = 60
+
     def __init__(self,
                  frames: pygame.Surface,
                  image_rect: pygame.Rect,
@@ -14,7 +33,8 @@ class Animator:
                  scale_to_fit: bool = False):
         self.frames = frames
         self.image_rect = image_rect
-        self.MAX_FRAME = int(frames.get_height()/image_rect.height) * 100
+        self.frame_count = max(1, int(frames.get_height()/image_rect.height))
+        self.MAX_FRAME = self.frame_count * 100
         self.current_frame = starting_frame
         self.starting_frame = starting_frame
         self.direction = direction
@@ -28,22 +48,41 @@ class Animator:
             self.speed = 0
         else:
             self.speed = speed
+        self.last_time = None
+        self._scaled = {}
+        self._scaled_size = None
 
     def start(self):
         self.current_frame = self.starting_frame
         self.direction = self.regular_direction
         self.update_rect()
         self.active = False
+        self.last_time = None
+        self._scaled.clear()
+
+    def get_index(self) -> int:
+        return max(0, min(int(self.current_frame/100), self.frame_count - 1))
 
     def update_rect(self):
-        self.image_rect.y = int(self.current_frame/100) * self.image_rect.height
+        self.image_rect.y = self.get_index() * self.image_rect.height
+
+    def advance(self):
+        """Moves current_frame on by however long it has been since the last draw."""
+        now = scheduler.now()
+        elapsed = 0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+        step = 100 * self.speed * elapsed * self.FRAME_RATE / 1000
+        if self.direction == 'backward':
+            self.current_frame -= step
+        elif self.direction == 'forward':
+            self.current_frame += step
 
-    def one_forward(self):
-        self.current_frame += int(100 * self.speed)
-        if self.current_frame > self.MAX_FRAME:
+    def finish(self):
+        """What happens once current_frame has run off either end of the sheet."""
+        if self.direction == 'forward' and self.current_frame > self.MAX_FRAME:
             match self.type:
                 case 'loops':
-                    self.current_frame = 0
+                    self.current_frame %= self.MAX_FRAME
                 case 'stay':
                     self.current_frame = self.MAX_FRAME
                 case 'once':
@@ -52,45 +91,148 @@ class Animator:
                     self.speed = 1
                     self.current_frame = self.MAX_FRAME - 1
                     self.direction = 'backward'
+        elif self.direction == 'backward':
+            if self.type == 'jump' and self.current_frame < (self.MAX_FRAME - 500):
+                self.current_frame += 1
+                self.direction = 'forward'
+            if self.current_frame < 0:
+                match self.type:
+                    case 'loops':
+                        self.current_frame %= self.MAX_FRAME
+                    case 'stay':
+                        self.current_frame = 0
+                    case 'once':
+                        self.active = False
+        if not self.active:
+            # Scaled frames are screen sized (8 MB each at 1080p), nothing needs them once it has stopped
+            self._scaled.clear()
 
-    def one_backward(self):
-        self.current_frame -= int(100 * self.speed)
-        if self.type == 'jump' and self.current_frame < (self.MAX_FRAME - 500):
-            self.current_frame += 1
-            self.direction = 'forward'
-        if self.current_frame < 0:
-            match self.type:
-                case 'loops':
-                    self.current_frame = self.MAX_FRAME
-                case 'stay':
-                    self.current_frame = 0
-                case 'once':
-                    self.active = False
+    def get_scaled(self, surface: pygame.Surface, vector: pygame.Vector2) -> pygame.Surface:
+        if self._scaled_size != surface.get_size():
+            self._scaled = {}
+            self._scaled_size = surface.get_size()
+        key = (self.get_index(), tuple(vector))
+        frame = self._scaled.get(key)
+        if frame is None:
+            frame = pygame.Surface(self.image_rect.size)
+            frame.blit(self.frames, vector, self.image_rect)
+            if surface.get_width()/self.image_rect.width > surface.get_height()/self.image_rect.height:
+                frame = pygame.transform.scale_by(frame, surface.get_width()/frame.get_width())
+            else:
+                frame = pygame.transform.scale_by(frame, surface.get_height()/frame.get_height())
+            frame = self._scaled[key] = frame.convert()
+        return frame
 
     def draw(self, surface: pygame.Surface, vector: pygame.Vector2 = pygame.Vector2(0, 0)):
         if self.active:
+            self.advance()
             self.update_rect()
             if self.scale_to_fit:
-                empty = pygame.Surface((self.image_rect.width, self.image_rect.height))
-                empty.blit(self.frames, vector, self.image_rect)
-                if surface.get_width()/self.image_rect.width > surface.get_height()/self.image_rect.height:
-                    empty = pygame.transform.scale_by(empty, surface.get_width()/empty.get_width())
-                else:
-                    empty = pygame.transform.scale_by(empty, surface.get_height()/empty.get_height())
-                surface.blit(empty, (0, 0))
+                surface.blit(self.get_scaled(surface, vector), (0, 0))
             else:
                 surface.blit(self.frames, vector, self.image_rect)
-            if self.direction == 'backward':
-                self.one_backward()
-            elif self.direction == 'forward':
-                self.one_forward()
+            # The last frame is still drawn on the draw that runs past the end, like it always was
+            self.finish()
 
     def play_forward(self):
         self.active = True
         self.direction = 'forward'
         self.current_frame = 0
+        self.last_time = None
 
     def play_backward(self):
         self.active = True
         self.direction = 'backward'
         self.current_frame = self.MAX_FRAME
+        self.last_time = None
+
+
+class StaticGenerator:
+    """
+    Synthesizes camera static into a small ring of reusable surfaces instead of decoding the static PNGs.
+    density is the share of pixels with any noise, alpha the strongest a pixel gets,
+    scanlines the height of the bright/dark bands and streak how far each noise sample is stretched sideways.
+    Without NumPy it falls back to the frames in resources/animations/static/.
+    """
+    _shared = None
+
+    def __init__(self,
+                 size: tuple[int, int] = (1920, 1080),
+                 frames: int = 6,
+                 density: float = .85,
+                 alpha: int = 170,
+                 scanlines: int = 16,
+                 streak: int = 8,
+                 seed: int = None,
+                 lazy: bool = False):
+        self.size = size
+        self.density = density
+        self.alpha = alpha
+        self.scanlines = scanlines
+        self.streak = max(1, streak)
+        self._rng = numpy.random.default_rng(seed) if numpy is not None else None
+        if numpy is not None:
+            self.frames = []
+            self.frame_count = frames
+        else:
+            self.frames = [cache.image(f'resources/animations/static/{frame}')
+                           for frame in os.listdir('resources/animations/static/')]
+            self.frame_count = len(self.frames)
+        self.index = 0
+        if not lazy:
+            for _ in self.load():
+                pass
+
+    def load(self):
+        """Generates the frames that are still missing, yielding after each."""
+        while len(self.frames) < self.frame_count:
+            self.frames.append(self.generate())
+            yield
+
+    @classmethod
+    def shared(cls, lazy: bool = False) -> 'StaticGenerator':
+        """The one every camera draws. With lazy its frames may still need load() run to the end."""
+        if cls._shared is None:
+            cls._shared = cls(pygame.display.get_surface().get_size(), lazy=True)
+        if not lazy:
+            for _ in cls._shared.load():
+                pass
+        return cls._shared
+
+    def generate(self) -> pygame.Surface:
+        width, height = self.size
+        rng = self._rng
+        columns = -(-width // self.streak)
+        noise = rng.random((columns, height), dtype=numpy.float32)
+        noise = numpy.repeat(noise, self.streak, axis=0)[:width]
+        shade = (noise ** 2 * 255).astype(numpy.uint8)
+
+        strength = rng.random((columns, height), dtype=numpy.float32) ** 2
+        strength = numpy.repeat(strength, self.streak, axis=0)[:width]
+        strength[rng.random((width, height), dtype=numpy.float32) > self.density] = 0
+        if self.scanlines:
+            rows = numpy.arange(height, dtype=numpy.float32) + rng.integers(self.scanlines)
+            strength *= .8 + .2 * numpy.cos(rows * (2 * numpy.pi / self.scanlines))
+        opacity = (strength * self.alpha).astype(numpy.uint8)
+
+        surface = pygame.Surface(self.size, pygame.SRCALPHA).convert_alpha()
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[...] = shade[..., None]
+        del pixels
+        pixels = pygame.surfarray.pixels_alpha(surface)
+        pixels[...] = opacity
+        del pixels
+        return surface
+
+    def next(self) -> pygame.Surface:
+        # Never shows the same frame twice in a row
+        if len(self.frames) > 1:
+            self.index = (self.index + random.randint(1, len(self.frames) - 1)) % len(self.frames)
+        return self.frames[self.index]
+
+    def draw(self, surface: pygame.Surface, opacity: int = 255, background: any = None):
+        if background is not None:
+            surface.fill(background)
+        frame = self.next()
+        frame.set_alpha(opacity)
+        surface.blit(frame, (0, 0))
@@ -1,9 +1,12 @@
 import json
 from data.game.constants import *
+from data.game.timing import MOVEMENT_TIMERS
 import pygame
 import random
-import os
 from .animation import Animator
+from .assets import cache, load_image, load_sound, sprites
+from .audio import HIGH, play
+from .scheduler import scheduler
 
 
 class Jumpscare:
@@ -51,13 +54,10 @@ class Animatronic:
         self.TIMER = timer
 
         self.FILE_LOCATION = f'resources/sprites/animatronics/{name}/'
-        self.images = os.listdir(self.FILE_LOCATION)
-        self.img_dict = {}
-        for image in self.images:
-            self.img_dict[image.removesuffix('.png')] = pygame.image.load(self.FILE_LOCATION + image).convert_alpha()
+        self.sprites = sprites
         if 'jumpscare' in self.load_data().keys():
             jump_data = self.load_data()['jumpscare']
-            self.jumpscare = Animator(pygame.image.load(self.FILE_LOCATION + "jumpscare.png").convert_alpha(),
+            self.jumpscare = Animator(load_image(self.FILE_LOCATION + "jumpscare.png"),
                                       pygame.rect.Rect(0, 0, jump_data[0],
                                                        jump_data[1]),
                                       scale_to_fit=True,
@@ -71,7 +71,7 @@ class Animatronic:
         image_path = self.load_data()['menu_label']['image_path']
         self.menu_label = MenuLabel(self.name, self._difficulty, description, image_path)
 
-        self.move_sounds = [pygame.mixer.Sound('resources/sounds/footsteps_' + str(i) + '.mp3') for i in range(1, 5)]
+        self.move_sounds = [cache.sound('resources/sounds/footsteps_' + str(i) + '.mp3') for i in range(1, 5)]
         for sound in self.move_sounds:
             sound.set_volume(.25)
 
@@ -86,6 +86,7 @@ class Animatronic:
         self._kill_locked = None
         self.active = None
         self.camera = None
+        self._layer_camera = None
 
     def start(self) -> None:
         self.video = None
@@ -96,17 +97,26 @@ class Animatronic:
 
         self.reset_aggression()
         self.update_images()
-        pygame.time.set_timer(self.TIMER, self.movement_timer)
+        scheduler.set_timer(self.TIMER, self.movement_timer)
 
     def stop(self) -> None:
         self._location = -1
         self.active = False
-        pygame.time.set_timer(self.TIMER, 0)
+        scheduler.set_timer(self.TIMER, 0)
 
-    def tick(self, event: pygame.event.Event) -> None:
+    @property
+    def events(self) -> tuple[int, ...]:
+        """The event types tick() does anything with."""
+        return self.TIMER, CAMERA_FLIPPED_DOWN
+
+    def update(self) -> None:
+        """Checks that do not wait for an event, run once a frame."""
         if self.active:
             if self._kill_locked and self._game.blacked_out:
                 self.kill()
+
+    def tick(self, event: pygame.event.Event) -> None:
+        if self.active:
             if event.type == self.TIMER:
                 if self._kill_locked:
                     self.kill()
@@ -151,7 +161,7 @@ class Animatronic:
         else:
             self.door.lock()
             self._kill_locked = True
-            pygame.time.set_timer(self.TIMER, random.randint(15000, 25000))
+            scheduler.set_timer(self.TIMER, random.randint(15000, 25000))
 
     def get_movement(self):
         movements = self._movement_key
@@ -165,18 +175,17 @@ class Animatronic:
     def play_move_sound(self, position):
         move_sound = self.move_sounds[random.randint(0, len(self.move_sounds) - 1)]
         move_sound.set_volume(0.25 * (position / len(self._movement_key)))
-        move_sound.play()
+        play(move_sound)
 
     def move(self, position: int) -> None:
         if self.camera.active:
             self.camera.small_glitch()
         self._update_camera()
         self.door.reset()
-        self.camera.reset_background()
         self._location = position
         self._game.update_animatronics()
         self.play_move_sound(position)
-        pygame.time.set_timer(self.TIMER, self.movement_timer)
+        scheduler.set_timer(self.TIMER, self.movement_timer)
         if self.camera.active:
             self.camera.small_glitch()
         self._update_camera()
@@ -185,13 +194,28 @@ class Animatronic:
         if self.active:
             if self._location != self.OFFICE_LOCATION:
                 self._update_camera()
-                self.camera.background.blit(self._get_image(), (0, 0))
+                self._set_layer(self._get_image())
             else:
-                self.door.curr_images['open_light'] = self.img_dict[self.name.lower() + '_' + 'open_light']
-                self.door.curr_images['closed_light'] = self.img_dict[self.name.lower() + '_' + 'closed_light']
+                self._set_layer(None)
+                self.door.curr_images['open_light'] = self._get_sprite('open_light')
+                self.door.curr_images['closed_light'] = self._get_sprite('closed_light')
+        else:
+            self._set_layer(None)
+
+    def _set_layer(self, image: pygame.Surface | None) -> None:
+        """Show image on the current camera, taking it off whichever camera had it before."""
+        camera = None if image is None else self.camera
+        if self._layer_camera is not None and self._layer_camera is not camera:
+            self._layer_camera.set_layer(self.name, None)
+        if camera is not None:
+            camera.set_layer(self.name, image, self._game.animatronics.index(self))
+        self._layer_camera = camera
 
     def _get_image(self) -> any:
-        return self.img_dict[self.name.lower() + '_' + str(self._location)]
+        return self._get_sprite(str(self._location))
+
+    def _get_sprite(self, suffix: str) -> pygame.Surface:
+        return self.sprites.get(f'{self.FILE_LOCATION}{self.name.lower()}_{suffix}.png')
 
     def _update_camera(self):
         if self._location != self.OFFICE_LOCATION:
@@ -204,9 +228,10 @@ class Chica(Animatronic):
     """
     Starts in the lunchroom, moves around the left side and attacks at the left door.
     """
+    MOVEMENT_TIMER = MOVEMENT_TIMERS['Chica']
 
     def __init__(self, game: any):
-        super().__init__('Chica', game, 4980, CHICA_TIMER, 0)
+        super().__init__('Chica', game, self.MOVEMENT_TIMER, CHICA_TIMER, 0)
 
     def move(self, position: int) -> None:
         lefty = self._game.animatronics[2]
@@ -217,11 +242,10 @@ class Chica(Animatronic):
                 self.camera.small_glitch()
             self._update_camera()
             self.door.reset()
-            self.camera.reset_background()
             self._location = position
             self._game.update_animatronics()
             self.play_move_sound(position)
-            pygame.time.set_timer(self.TIMER, self.movement_timer)
+            scheduler.set_timer(self.TIMER, self.movement_timer)
             if self.camera.active:
                 self.camera.small_glitch()
             self._update_camera()
@@ -231,34 +255,26 @@ class Bonnie(Animatronic):
     """
     Starts in the UNDG_Storage, moves around the right side and attacks at the left door.
     """
+    MOVEMENT_TIMER = MOVEMENT_TIMERS['Bonnie']
 
     def __init__(self, game: any):
-        super().__init__('Bonnie', game, 4970, BONNIE_TIMER, 1)
+        super().__init__('Bonnie', game, self.MOVEMENT_TIMER, BONNIE_TIMER, 1)
 
 
 class Lefty(Animatronic):
     """
     Starts in the lunchroom, moves around the left side and attacks at the left door.
     """
+    MOVEMENT_TIMER = MOVEMENT_TIMERS['Lefty']
 
     def __init__(self, game: any):
-        super().__init__('Lefty', game, 3020, LEFTY_TIMER, 0)
+        super().__init__('Lefty', game, self.MOVEMENT_TIMER, LEFTY_TIMER, 0)
 
-    def tick(self, event: pygame.event.Event) -> None:
-        if self.active:
-            if self.camera.active:
-                pygame.time.set_timer(self.TIMER, self.movement_timer)
-            if self._kill_locked and self._game.blacked_out:
-                self.kill()
-            if event.type == self.TIMER:
-                if self._kill_locked:
-                    self.kill()
-                # Movement Opportunities
-                rng = random.randint(1, 20)
-                if rng <= self._aggression:
-                    self.successful_movement()
-            if event.type == CAMERA_FLIPPED_DOWN and self._kill_locked:
-                self.kill()
+    def update(self) -> None:
+        if self.active and self.camera.active:
+            # Being watched holds it where it is
+            scheduler.set_timer(self.TIMER, self.movement_timer)
+        super().update()
 
     def move(self, position: int) -> None:
         chica = self._game.animatronics[1]
@@ -269,11 +285,10 @@ class Lefty(Animatronic):
                 self.camera.small_glitch()
             self._update_camera()
             self.door.reset()
-            self.camera.reset_background()
             self._location = position
             self._game.update_animatronics()
             self.play_move_sound(position)
-            pygame.time.set_timer(self.TIMER, self.movement_timer)
+            scheduler.set_timer(self.TIMER, self.movement_timer)
             if self.camera.active:
                 self.camera.small_glitch()
 
@@ -282,14 +297,15 @@ class Knight(Animatronic):
     """
     Starts in the lunchroom, moves around the left side and attacks at the left door.
     """
+    MOVEMENT_TIMER = MOVEMENT_TIMERS['Knight']
 
     def __init__(self, game: any):
-        super().__init__('Knight', game, 5010, KNIGHT_TIMER, 0)
+        super().__init__('Knight', game, self.MOVEMENT_TIMER, KNIGHT_TIMER, 0)
         self.primed = False
         self.running = False
         self.locked = False
         self.attack_num = 0
-        self.run_sound = pygame.mixer.Sound('resources/sounds/fnaf-running.mp3')
+        self.run_sound = load_sound('resources/sounds/fnaf-running.mp3')
         self.OFFICE_LOCATION = 3
 
     def start(self):
@@ -299,7 +315,7 @@ class Knight(Animatronic):
         self.running = False
         self.locked = False
         self.attack_num = 0
-        pygame.time.set_timer(self.TIMER, self.movement_timer)
+        scheduler.set_timer(self.TIMER, self.movement_timer)
         self._location = 0
         self.reset_aggression()
         self.update_images()
@@ -307,8 +323,8 @@ class Knight(Animatronic):
     def run(self):
         self.primed = False
         self.running = True
-        pygame.mixer.find_channel(True).play(self.run_sound)
-        pygame.time.set_timer(self.TIMER, int(self.run_sound.get_length() * 1000))
+        play(self.run_sound, priority=HIGH)
+        scheduler.set_timer(self.TIMER, int(self.run_sound.get_length() * 1000))
 
     def get_to_door(self):
         if self.door.door_status == 'closed':
@@ -319,24 +335,30 @@ class Knight(Animatronic):
 
     def blocked(self):
         self.running = False
-        pygame.time.set_timer(self.TIMER, self.movement_timer)
+        scheduler.set_timer(self.TIMER, self.movement_timer)
         self.move(self.get_movement())
         self._game.power_manager.power_remaining -= (5 * self.attack_num + 1) * 1000
         self.attack_num += 1
 
+    @property
+    def events(self) -> tuple[int, ...]:
+        return self.TIMER,
+
+    def update(self) -> None:
+        if self.active and self.camera.active:
+            if self.primed:
+                self.run()
+            elif not self.running:
+                self.locked = True
+                scheduler.set_timer(self.TIMER, random.randint(830, 16670))
+
     def tick(self, event: pygame.event.Event) -> None:
         if self.active:
-            if self.camera.active:
-                if self.primed:
-                    self.run()
-                elif not self.running:
-                    self.locked = True
-                    pygame.time.set_timer(self.TIMER, random.randint(830, 16670))
             if event.type == self.TIMER:
                 if self.locked:
                     self.locked = False
                 else:
-                    pygame.time.set_timer(self.TIMER, self.movement_timer)
+                    scheduler.set_timer(self.TIMER, self.movement_timer)
                     rng = random.randint(1, 20)
                     if self.primed:
                         self.run()
@@ -347,29 +369,31 @@ class Knight(Animatronic):
                         self.successful_movement()
 
     def move(self, position: int) -> None:
-        self.camera.reset_background()
         self._location = position
         self._game.update_animatronics()
 
     def successful_movement(self):
         self.move(self.get_movement())
         if self._location == self.OFFICE_LOCATION:
-            pygame.time.set_timer(self.TIMER, 25000)
+            scheduler.set_timer(self.TIMER, 25000)
             self.primed = True
 
     def update_images(self) -> None:
-        self.camera.background.blit(self._get_image(), (0, 0))
+        self._set_layer(self._get_image())
 
 
 class Garble(Animatronic):
+    MOVEMENT_TIMER = MOVEMENT_TIMERS['Garble']
+
     def __init__(self, game: any):
-        super().__init__("Garble", game, 5010, HITCH_TIMER, 0)
-        self.images = None
-        self.img_dict = None
-        self.black = pygame.surface.Surface((1920*2, 1080))
+        super().__init__("Garble", game, self.MOVEMENT_TIMER, HITCH_TIMER, 0)
+        width, height = pygame.display.get_surface().get_size()
+        self.black = pygame.surface.Surface((width*2, height))
         self.black.fill('black')
 
     def update_images(self) -> None:
         if self._difficulty > 0:
             self._update_camera()
-            self.camera.background.blit(self.black, (0, 0))
+            self._set_layer(self.black)
+        else:
+            self._set_layer(None)
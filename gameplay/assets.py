@@ -0,0 +1,299 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pygame
+from .audio import is_streamed
+
+IMAGE_TYPES = ('.png',)
+SOUND_TYPES = ('.mp3', '.ogg', '.wav')
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+class AssetLoader:
+    """
+    Decodes images and sounds on a pool of worker threads.
+    The workers only decode; converting a surface to the display format
+    happens on the main thread the first time the asset is asked for.
+    """
+    def __init__(self, workers: int = None):
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        self._images = {}
+        self._sounds = {}
+        self._pending = {}
+        self.timings = {}
+        self.pack = None
+
+    def preload(self, paths: list[str], progress: any = None, wait: bool = True) -> None:
+        """
+        Decode every path in paths. With wait the call blocks and progress is called on the main thread
+        with (done, total, path) after each asset finishes. Without it the decoding carries on in the
+        background and image()/sound() pick the results up as they are asked for.
+        """
+        paths = [path for path in paths if _key(path) not in self._images and _key(path) not in self._sounds
+                 and _key(path) not in self._pending and not (self.pack is not None and path in self.pack)]
+        pool = ThreadPoolExecutor(self.workers)
+        futures = {}
+        for path in paths:
+            future = pool.submit(self._decode, path)
+            futures[future] = path
+            self._pending[_key(path)] = future
+        pool.shutdown(wait=False)
+        if wait:
+            for done, future in enumerate(as_completed(futures), 1):
+                self._collect(futures[future])
+                if progress is not None:
+                    progress(done, len(paths), futures[future])
+
+    def _collect(self, path: str) -> None:
+        """Move a finished (or still running, then wait for it) background decode into the loaded assets."""
+        future = self._pending.pop(_key(path), None)
+        if future is None:
+            return
+        try:
+            asset, elapsed = future.result()
+        except (FileNotFoundError, pygame.error):
+            return
+        self.timings[path] = elapsed
+        if isinstance(asset, pygame.mixer.Sound):
+            self._sounds[_key(path)] = asset
+        else:
+            self._images[_key(path)] = asset
+
+    @staticmethod
+    def _decode(path: str):
+        start = time.perf_counter()
+        if path.lower().endswith(IMAGE_TYPES):
+            asset = pygame.image.load(path)
+        else:
+            asset = pygame.mixer.Sound(path)
+        return asset, time.perf_counter() - start
+
+    def image(self, path: str, alpha: bool = True) -> pygame.Surface:
+        if self.pack is not None and path in self.pack:
+            # Already a private copy in the display format, only opaque images need the alpha channel dropped
+            image = self.pack.surface(path)
+            return image if alpha else image.convert()
+        self._collect(path)
+        # Images stay around until release() since converting makes a copy anyway
+        image = self._images.get(_key(path))
+        if image is None:
+            image = pygame.image.load(path)
+        return image.convert_alpha() if alpha else image.convert()
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        self._collect(path)
+        # Sounds carry their own volume so every caller gets its own object
+        sound = self._sounds.pop(_key(path), None)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+        return sound
+
+    def release(self) -> None:
+        """Drop everything that was preloaded but never asked for."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._images.clear()
+        self._sounds.clear()
+
+    def report(self, limit: int = 20) -> str:
+        slowest = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:limit]
+        lines = [f"Decoded {len(self.timings)} assets in {sum(self.timings.values()):.2f}s of worker time"]
+        for path, elapsed in slowest:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  {path}")
+        return '\n'.join(lines)
+
+
+class AssetCache:
+    """
+    Shares decoded assets across the whole process.
+    Entries are keyed by path and load options and counted every time they are handed out;
+    release() gives a reference back and evict() drops whatever nobody holds anymore.
+    Anything that comes out of here is shared, so callers must not draw onto it.
+    """
+    def __init__(self, source: AssetLoader):
+        self.source = source
+        self._entries = {}
+        self._keys = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _acquire(self, key: tuple, create: any):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._entries[key] = [create(), 0]
+            self._keys[id(entry[0])] = key
+        else:
+            self.hits += 1
+        entry[1] += 1
+        return entry[0]
+
+    def image(self, path: str, alpha: bool = True, scale: float = 1, opacity: int = None) -> pygame.Surface:
+        key = ('image', _key(path), alpha, scale, opacity)
+        if scale == 1 and opacity is None:
+            return self._acquire(key, lambda: self.source.image(path, alpha))
+
+        def derive():
+            image = self.image(path, alpha)
+            self.release(image)
+            if scale != 1:
+                image = pygame.transform.scale_by(image, scale)
+            else:
+                image = image.copy()
+            if opacity is not None:
+                image.set_alpha(opacity)
+            return image
+        return self._acquire(key, derive)
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        return self._acquire(('sound', _key(path)), lambda: self.source.sound(path))
+
+    def font(self, path: str, size: int) -> pygame.font.Font:
+        return self._acquire(('font', _key(path), size), lambda: pygame.font.Font(path, size))
+
+    def release(self, asset: any) -> None:
+        key = self._keys.get(id(asset))
+        if key is not None:
+            entry = self._entries[key]
+            entry[1] = max(entry[1] - 1, 0)
+
+    def evict(self, path: str = None) -> int:
+        """Drop unreferenced entries, only the ones for path if given. Returns how many were dropped."""
+        dropped = 0
+        for key, (asset, refs) in list(self._entries.items()):
+            if refs == 0 and (path is None or key[1] == _key(path)):
+                del self._entries[key]
+                del self._keys[id(asset)]
+                dropped += 1
+        return dropped
+
+    def refs(self, asset: any) -> int:
+        key = self._keys.get(id(asset))
+        return 0 if key is None else self._entries[key][1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SpriteResidency:
+    """
+    Keeps sprites in memory only while they are in use.
+    Images load the first time they are asked for and the least recently used ones
+    are dropped once the total goes over budget bytes.
+    Sprites are drawn at scale, the render scale of the display.
+    """
+    def __init__(self, source: AssetLoader, budget: int = 256 * 1024 * 1024, scale: float = 1):
+        self.source = source
+        self.budget = budget
+        self.scale = scale
+        self.resident = 0
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+
+    def get(self, path: str) -> pygame.Surface:
+        key = _key(path)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+        self.misses += 1
+        sprite = self._sprites[key] = scale_by(self.source.image(path), self.scale)
+        self.resident += self.size_of(sprite)
+        self.trim()
+        return sprite
+
+    def trim(self) -> None:
+        # The newest sprite always stays, even if it is bigger than the budget on its own
+        while self.resident > self.budget and len(self._sprites) > 1:
+            _, sprite = self._sprites.popitem(last=False)
+            self.resident -= self.size_of(sprite)
+
+    def set_budget(self, budget: int) -> None:
+        self.budget = budget
+        self.trim()
+
+    def clear(self) -> None:
+        self._sprites.clear()
+        self.resident = 0
+
+    @staticmethod
+    def size_of(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def __contains__(self, path: str) -> bool:
+        return _key(path) in self._sprites
+
+
+class TextCache:
+    """
+    Rendered text keyed by (font, text, antialias, color), the least recently used dropped past limit entries.
+    Like AssetCache, surfaces are shared and must not be drawn onto.
+    """
+    def __init__(self, limit: int = 256):
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._texts = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color: any) -> pygame.Surface:
+        key = (font, text, antialias, tuple(pygame.Color(color)))
+        surface = self._texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self._texts[key] = font.render(text, antialias, color)
+        if len(self._texts) > self.limit:
+            self._texts.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self._texts.clear()
+
+    def __len__(self):
+        return len(self._texts)
+
+
+def collect_assets(directory: str = 'resources/') -> list[str]:
+    """Every image and sound under directory that is not streamed, biggest first so the pool stays busy."""
+    found = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            path = os.path.join(root, file).replace('\\', '/')
+            if file.lower().endswith(IMAGE_TYPES + SOUND_TYPES) and not is_streamed(path):
+                found.append(path)
+    return sorted(found, key=os.path.getsize, reverse=True)
+
+
+loader = AssetLoader()
+cache = AssetCache(loader)
+sprites = SpriteResidency(loader)
+texts = TextCache()
+
+
+def scale_by(surface: pygame.Surface, factor: float) -> pygame.Surface:
+    """pygame.transform.scale_by that hands the surface back untouched when there is nothing to scale."""
+    if factor == 1:
+        return surface
+    return pygame.transform.scale_by(surface, factor)
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color: any) -> pygame.Surface:
+    return texts.render(font, text, antialias, color)
+
+
+def load_image(path: str, alpha: bool = True) -> pygame.Surface:
+    return loader.image(path, alpha)
+
+
+def load_sound(path: str) -> pygame.mixer.Sound:
+    return loader.sound(path)
@@ -0,0 +1,99 @@
+"""
+Texture atlases for the small UI images.
+Packing the icons and buttons into one sheet means one surface allocation instead of dozens,
+and a resolution change rescales one sheet instead of every image on it.
+"""
+import os
+
+import pygame
+from .assets import loader, scale_by
+
+
+class TextureAtlas:
+    """
+    Packs images into a single sheet with a shelf packer and keeps the rect of each one by name.
+    get() hands out subsurfaces, which share the sheet's pixels, and draw() blits straight from the sheet.
+    The unscaled sheet is kept so rescale() always starts from the original pixels.
+    """
+    _shared = None
+
+    def __init__(self, images: dict[str, str], scale: float = 1, padding: int = 2, max_width: int = 1024):
+        self.padding = padding
+        self._source_rects = {}
+        self._source = self.pack({name: loader.image(path) for name, path in images.items()}, max_width)
+        self.scale = None
+        self.sheet = None
+        self.rects = {}
+        self._subsurfaces = {}
+        self.rescale(scale)
+
+    @classmethod
+    def from_directory(cls, directory: str, scale: float = 1, recursive: bool = True, **kwargs) -> 'TextureAtlas':
+        """Every PNG under directory, named by its path relative to directory without the extension ('active/1A')."""
+        images = {}
+        for root, dirs, files in os.walk(directory):
+            if not recursive:
+                dirs.clear()
+            for file in files:
+                if file.lower().endswith('.png'):
+                    path = os.path.join(root, file)
+                    name = os.path.splitext(os.path.relpath(path, directory))[0].replace('\\', '/')
+                    images[name] = path.replace('\\', '/')
+        return cls(images, scale, **kwargs)
+
+    @classmethod
+    def shared(cls) -> 'TextureAtlas':
+        """The loose button images in resources/ui/buttons (flick, reset), used at their own size."""
+        if cls._shared is None:
+            cls._shared = cls.from_directory('resources/ui/buttons', recursive=False)
+        return cls._shared
+
+    def pack(self, images: dict[str, pygame.Surface], max_width: int) -> pygame.Surface:
+        # Tallest first keeps each shelf close to the height of what is on it
+        order = sorted(images, key=lambda name: images[name].get_height(), reverse=True)
+        width = max([max_width] + [images[name].get_width() + self.padding * 2 for name in order])
+        x = y = self.padding
+        shelf = 0
+        for name in order:
+            w, h = images[name].get_size()
+            if x + w + self.padding > width:
+                x = self.padding
+                y += shelf + self.padding
+                shelf = 0
+            self._source_rects[name] = pygame.Rect(x, y, w, h)
+            x += w + self.padding
+            shelf = max(shelf, h)
+        height = y + shelf + self.padding
+
+        sheet = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        sheet.fill((0, 0, 0, 0))
+        for name in order:
+            # Max against the cleared sheet copies the pixels as they are instead of blending them onto black
+            sheet.blit(images[name], self._source_rects[name], special_flags=pygame.BLEND_RGBA_MAX)
+        return sheet
+
+    def rescale(self, scale: float) -> None:
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.sheet = scale_by(self._source, scale)
+        bounds = self.sheet.get_rect()
+        self.rects = {name: pygame.Rect(round(rect.x * scale), round(rect.y * scale),
+                                        max(1, round(rect.w * scale)), max(1, round(rect.h * scale))).clip(bounds)
+                      for name, rect in self._source_rects.items()}
+        self._subsurfaces = {}
+
+    def get(self, name: str) -> pygame.Surface:
+        surface = self._subsurfaces.get(name)
+        if surface is None:
+            surface = self._subsurfaces[name] = self.sheet.subsurface(self.rects[name])
+        return surface
+
+    def draw(self, surface: pygame.Surface, name: str, pos: tuple[int, int] | pygame.Rect) -> pygame.Rect:
+        return surface.blit(self.sheet, pos, self.rects[name])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.rects
+
+    def __len__(self):
+        return len(self.rects)
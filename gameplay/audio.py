@@ -0,0 +1,274 @@
+import struct
+
+import pygame
+
+# Long tracks that are streamed from disk instead of being decoded into a Sound up front
+STREAMED = ('resources/sounds/night_',
+            'resources/sounds/main_menu.mp3',
+            'resources/sounds/five-nights-at-freddys-6-am.mp3')
+
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+
+
+def _frame_header(data: bytes, i: int) -> tuple | None:
+    """(sample rate, samples, frame length, side info size) of the MPEG audio frame starting at i."""
+    if i + 4 > len(data) or data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+        return None
+    header = struct.unpack('>I', data[i:i + 4])[0]
+    version = {0: 2.5, 2: 2, 3: 1}.get((header >> 19) & 3)
+    layer = {1: 3, 2: 2, 3: 1}.get((header >> 17) & 3)
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (header >> 9) & 1
+    mono = (header >> 6) & 3 == 3
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if layer == 3 and version != 1 else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    side_info = (17 if mono else 32) if version == 1 else (9 if mono else 17)
+    return sample_rate, samples, length, side_info
+
+
+def mp3_length(path: str) -> float | None:
+    """
+    Length of an MP3 in seconds, read from its frame headers so nothing gets decoded.
+    Uses the Xing/Info or VBRI frame count when there is one and walks every frame header otherwise.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    start = 0
+    if data[:3] == b'ID3':
+        tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + tag_size + (10 if data[5] & 0x10 else 0)
+
+    # The first frame is the first header that another header follows
+    i = start
+    while i < len(data) - 4:
+        frame = _frame_header(data, i)
+        if frame is not None and _frame_header(data, i + frame[2]) is not None:
+            break
+        i += 1
+    else:
+        return None
+
+    sample_rate, samples, length, side_info = frame
+    xing = i + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info') and struct.unpack('>I', data[xing + 4:xing + 8])[0] & 1:
+        return struct.unpack('>I', data[xing + 8:xing + 12])[0] * samples / sample_rate
+    vbri = i + 36
+    if data[vbri:vbri + 4] == b'VBRI':
+        return struct.unpack('>I', data[vbri + 14:vbri + 18])[0] * samples / sample_rate
+
+    seconds = 0
+    while frame is not None and frame[2] > 0:
+        seconds += frame[1] / frame[0]
+        i += frame[2]
+        frame = _frame_header(data, i)
+    return seconds
+
+
+# How important a sound is when every channel is busy, see Mixer.play
+LOW = 0
+NORMAL = 1
+HIGH = 2
+CRITICAL = 3
+
+
+class Bus:
+    """A volume group. Its level is its own volume, times any ducking, times its parent's level."""
+    def __init__(self, name: str, volume: float = 1, parent: 'Bus' = None):
+        self.name = name
+        self.volume = volume
+        self.duck = 1
+        self.parent = parent
+
+    @property
+    def level(self) -> float:
+        level = self.volume * self.duck
+        return level if self.parent is None else level * self.parent.level
+
+
+class Voice:
+    __slots__ = ('sound', 'bus', 'priority', 'started', 'level')
+
+    def __init__(self, sound: pygame.mixer.Sound, bus: Bus, priority: int, started: int):
+        self.sound = sound
+        self.bus = bus
+        self.priority = priority
+        self.started = started
+        self.level = bus.level
+
+
+class Mixer:
+    """
+    Plays sounds on buses (master with ambience, sfx, voice and music under it).
+    A channel's volume is its bus's level, set when a sound starts on it and again only when that level changes;
+    the sound's own volume still multiplies in on top. When every channel is busy a sound takes the channel
+    playing the lowest priority below its own, the oldest of those if there are several, or is not played at all.
+    CRITICAL sounds are never taken over.
+    While something plays on the voice bus (the phone calls) the ambience is ducked.
+    """
+    BUSES = ('ambience', 'sfx', 'voice', 'music')
+    DUCK = .4
+
+    def __init__(self):
+        self.master = Bus('master')
+        self.buses = {'master': self.master}
+        for name in self.BUSES:
+            self.buses[name] = Bus(name, parent=self.master)
+        self._channels = None
+        self._voices = []
+        self._order = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    @property
+    def channels(self) -> list[pygame.mixer.Channel]:
+        if self._channels is None or len(self._channels) != pygame.mixer.get_num_channels():
+            self._channels = [pygame.mixer.Channel(i) for i in range(pygame.mixer.get_num_channels())]
+            self._voices = [None] * len(self._channels)
+        return self._channels
+
+    def level(self, bus: str) -> float:
+        return self.buses[bus].level
+
+    def play(self, sound: pygame.mixer.Sound, bus: str = 'sfx', priority: int = NORMAL,
+             loops: int = 0, maxtime: int = 0, fade_ms: int = 0) -> pygame.mixer.Channel | None:
+        """Plays sound on bus like Sound.play. Returns the channel it got, None if it had to be dropped."""
+        index = self._claim(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        self._order += 1
+        self._voices[index] = Voice(sound, self.buses[bus], priority, self._order)
+        channel.set_volume(self._voices[index].level)
+        channel.play(sound, loops, maxtime, fade_ms)
+        return channel
+
+    def _claim(self, priority: int) -> int | None:
+        channels = self.channels
+        candidates = []
+        for i, channel in enumerate(channels):
+            if not channel.get_busy():
+                return i
+            voice = self._voices[i]
+            # A channel started behind the mixer's back has no priority to go on, so it is left alone
+            if voice is not None and voice.priority < priority and voice.priority < CRITICAL:
+                candidates.append((voice.priority, voice.started, i))
+        if not candidates:
+            return None
+        _, _, victim = min(candidates)
+        self.stolen += 1
+        channels[victim].stop()
+        return victim
+
+    def set_volume(self, bus: str, volume: float) -> None:
+        if self.buses[bus].volume != volume:
+            self.buses[bus].volume = volume
+            self.apply()
+
+    def set_duck(self, bus: str, duck: float) -> None:
+        if self.buses[bus].duck != duck:
+            self.buses[bus].duck = duck
+            self.apply()
+
+    def apply(self) -> None:
+        """Puts every playing channel and the music stream at their bus's level."""
+        for channel, voice in zip(self.channels, self._voices):
+            if voice is not None and voice.level != voice.bus.level and channel.get_busy():
+                voice.level = voice.bus.level
+                channel.set_volume(voice.level)
+        MusicStream.refresh()
+
+    def update(self) -> None:
+        """Once a frame, ducks the ambience while a phone call plays."""
+        current = MusicStream._current
+        talking = current is not None and current.bus == 'voice' and pygame.mixer.music.get_busy()
+        self.set_duck('ambience', self.DUCK if talking else 1)
+
+
+class MusicStream:
+    """
+    A long track played through pygame.mixer.music, which decodes it a chunk at a time.
+    Mirrors the parts of pygame.mixer.Sound the game uses (play, stop, fadeout, get_length, set_volume)
+    so it can stand in for one. Every stream shares the one music channel, so only one plays at a time:
+    starting the phone call, the menu music or the 6 AM track cuts off whichever of them was playing.
+    Its volume is scaled by its bus in the mixer.
+    """
+    _current = None
+
+    def __init__(self, path: str, bus: str = 'music'):
+        self.path = path
+        self.bus = bus
+        self.volume = 1
+        self._length = None
+
+    def play(self, loops: int = 0, fade_ms: int = 0) -> None:
+        pygame.mixer.music.load(self.path)
+        MusicStream._current = self
+        self._apply_volume()
+        pygame.mixer.music.play(loops, fade_ms=fade_ms)
+
+    def stop(self) -> None:
+        if MusicStream._current is self:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+            MusicStream._current = None
+
+    def fadeout(self, time: int) -> None:
+        if MusicStream._current is self:
+            pygame.mixer.music.fadeout(time)
+
+    def playing(self) -> bool:
+        return MusicStream._current is self and pygame.mixer.music.get_busy()
+
+    def get_length(self) -> float:
+        if self._length is None:
+            if self.path.lower().endswith('.mp3'):
+                self._length = mp3_length(self.path)
+            if self._length is None:
+                # Not something the header parser understands, pay for one decode
+                self._length = pygame.mixer.Sound(self.path).get_length()
+        return self._length
+
+    def set_volume(self, value: float) -> None:
+        self.volume = value
+        self._apply_volume()
+
+    def get_volume(self) -> float:
+        return self.volume
+
+    def _apply_volume(self) -> None:
+        if MusicStream._current is self:
+            pygame.mixer.music.set_volume(self.volume * mixer.level(self.bus))
+
+    @classmethod
+    def refresh(cls) -> None:
+        if cls._current is not None:
+            cls._current._apply_volume()
+
+
+mixer = Mixer()
+
+
+def play(sound: pygame.mixer.Sound, bus: str = 'sfx', priority: int = NORMAL, **kwargs) -> pygame.mixer.Channel | None:
+    return mixer.play(sound, bus, priority, **kwargs)
+
+
+def is_streamed(path: str) -> bool:
+    return path.replace('\\', '/').startswith(STREAMED)
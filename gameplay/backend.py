@@ -0,0 +1,189 @@
+"""
+Render backends. Office, Cameras, Animator and the HUD only ever draw with blit(), fill(), the get_size()
+family and draw_rect() from here, so what they draw into can be the display surface (the default) or a
+TextureBackend, which keeps every image it is handed on the GPU and composites them with pygame._sdl2's Renderer.
+Images are uploaded the first time they are drawn and kept for as long as the surface lives, so a surface that is
+drawn onto after that has to be passed to changed() to be uploaded again.
+"""
+import weakref
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Renderer, Texture, Window
+except ImportError:
+    Renderer = Texture = Window = None
+
+# SDL_BlendMode values, pygame._sdl2 takes them as plain ints
+BLENDMODE_NONE = 0
+BLENDMODE_BLEND = 1
+BLENDMODE_ADD = 2
+BLENDMODE_MOD = 4
+
+# The special_flags SDL has a blend mode for, anything else is blended on the CPU, see TextureBackend.blend()
+BLEND_MODES = {0: BLENDMODE_BLEND, pygame.BLEND_RGB_ADD: BLENDMODE_ADD, pygame.BLEND_RGB_MULT: BLENDMODE_MOD}
+
+_backends = weakref.WeakSet()
+
+
+class TextureBackend:
+    """
+    Draws through the display's Renderer. When the window was opened with pygame.SCALED it already has one,
+    which SDL made on the GPU if there is one and in software if not; otherwise one is made the same way here.
+    Subsurfaces (atlas entries, frames of a sheet) are drawn out of their parent's texture, so a whole atlas is
+    one upload. A parent too big to be a texture is uploaded a piece at a time instead.
+    """
+    def __init__(self, window: 'Window' = None):
+        self.window = window or Window.from_display_module()
+        try:
+            self.renderer = Renderer.from_window(self.window)
+        except pygame.error:
+            try:
+                self.renderer = Renderer(self.window, accelerated=1)
+            except pygame.error:
+                self.renderer = Renderer(self.window, accelerated=0)
+            self.renderer.logical_size = pygame.display.get_surface().get_size()
+        self.size = tuple(self.renderer.logical_size)
+        self.textures = weakref.WeakKeyDictionary()
+        self.uploads = 0
+        _backends.add(self)
+
+    def texture(self, surface: pygame.Surface, area: pygame.Rect) -> tuple['Texture', pygame.Rect]:
+        """The texture holding area of surface and where in the texture it is."""
+        parent = surface.get_abs_parent()
+        offset = surface.get_abs_offset()
+        area = area.move(offset)
+        texture = self.textures.get(parent)
+        if texture is None:
+            try:
+                texture = Texture.from_surface(self.renderer, parent)
+            except pygame.error:
+                texture = {}
+            self.textures[parent] = texture
+            self.uploads += 1
+        if isinstance(texture, dict):
+            piece = texture.get(tuple(area))
+            if piece is None:
+                piece = texture[tuple(area)] = Texture.from_surface(self.renderer, parent.subsurface(area))
+                self.uploads += 1
+            return piece, piece.get_rect()
+        return texture, area
+
+    def forget(self, surface: pygame.Surface) -> None:
+        self.textures.pop(surface.get_abs_parent(), None)
+
+    def blit(self, source: pygame.Surface, dest: any, area: pygame.Rect = None, special_flags: int = 0) -> pygame.Rect:
+        x, y = dest[:2] if not isinstance(dest, pygame.Rect) else dest.topleft
+        x, y = int(x), int(y)
+        bounds = source.get_rect()
+        if area is None:
+            area = bounds
+        else:
+            area = pygame.Rect(area)
+            # Clipping the area moves the destination with it, the same as Surface.blit
+            clipped = area.clip(bounds)
+            x += clipped.x - area.x
+            y += clipped.y - area.y
+            area = clipped
+        dest = pygame.Rect((x, y), area.size)
+        if not area.width or not area.height:
+            return dest
+        if special_flags not in BLEND_MODES:
+            return self.blend(dest, lambda backdrop, at: backdrop.blit(source, at, area, special_flags))
+        texture, src = self.texture(source, area)
+        texture.blend_mode = BLEND_MODES[special_flags]
+        alpha = source.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        texture.draw(src, dest)
+        return dest.clip(self.get_rect())
+
+    def fill(self, color: any, rect: pygame.Rect = None, special_flags: int = 0) -> pygame.Rect:
+        renderer = self.renderer
+        rect = self.get_rect() if rect is None else pygame.Rect(rect).clip(self.get_rect())
+        if special_flags and special_flags not in BLEND_MODES:
+            return self.blend(rect, lambda backdrop, at: backdrop.fill(color, (at, rect.size), special_flags))
+        color = pygame.Color(color)
+        color.a = 255
+        renderer.draw_color = color
+        renderer.draw_blend_mode = BLENDMODE_NONE if not special_flags else BLEND_MODES[special_flags]
+        renderer.fill_rect(rect)
+        return rect
+
+    def blend(self, rect: pygame.Rect, draw: any) -> pygame.Rect:
+        """
+        The slow way for blend modes SDL does not have: reads back what is under rect, has draw(backdrop, pos)
+        do the blit or fill on it with pygame at pos, the rect's spot on the backdrop, and draws the result back.
+        """
+        clipped = rect.clip(self.get_rect())
+        if not clipped.width or not clipped.height:
+            return clipped
+        backdrop = self.renderer.to_surface(area=clipped)
+        draw(backdrop, (rect.x - clipped.x, rect.y - clipped.y))
+        texture = Texture.from_surface(self.renderer, backdrop)
+        texture.blend_mode = BLENDMODE_NONE
+        texture.draw(None, clipped)
+        return clipped
+
+    def draw_rect(self, color: any, rect: pygame.Rect, width: int = 0) -> pygame.Rect:
+        rect = pygame.Rect(rect)
+        if width <= 0:
+            return self.fill(color, rect)
+        # One rect per edge, corners are left square
+        self.fill(color, (rect.x, rect.y, rect.width, width))
+        self.fill(color, (rect.x, rect.bottom - width, rect.width, width))
+        self.fill(color, (rect.x, rect.y + width, width, rect.height - 2 * width))
+        self.fill(color, (rect.right - width, rect.y + width, width, rect.height - 2 * width))
+        return rect
+
+    def get_size(self) -> tuple[int, int]:
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self) -> pygame.Rect:
+        return pygame.Rect((0, 0), self.size)
+
+    def clear(self) -> None:
+        self.fill('black')
+
+    def present(self) -> None:
+        self.renderer.present()
+
+    def snapshot(self) -> pygame.Surface:
+        """What has been drawn since the last present() as a surface."""
+        return self.renderer.to_surface()
+
+
+def texture_backend() -> TextureBackend | None:
+    """A TextureBackend for the display, or None if this pygame has no pygame._sdl2 to make one with."""
+    if Renderer is None:
+        return None
+    try:
+        return TextureBackend()
+    except pygame.error:
+        return None
+
+
+def composited(target: any) -> bool:
+    """
+    Whether target stacks images on the GPU. Drawing pieces one by one costs next to nothing there,
+    so anything that caches a stack of them in a surface can skip doing so.
+    """
+    return not isinstance(target, pygame.Surface)
+
+
+def changed(surface: pygame.Surface) -> None:
+    """Call after drawing onto a surface that may already be a texture, so it is uploaded again."""
+    for backend in _backends:
+        backend.forget(surface)
+
+
+def draw_rect(target: any, color: any, rect: pygame.Rect, width: int = 0, border_radius: int = -1) -> pygame.Rect:
+    """pygame.draw.rect for any render target. Rounded corners only come out on surfaces."""
+    if isinstance(target, pygame.Surface):
+        return pygame.draw.rect(target, color, rect, width, border_radius)
+    return target.draw_rect(color, rect, width)
@@ -0,0 +1,67 @@
+"""
+Hands each event only to the handlers that subscribed to its type.
+Handlers for a type run in the order they subscribed, and every dispatched event is counted by type.
+"""
+from collections import Counter
+
+
+class EventBus:
+    def __init__(self):
+        # Tuples, so subscribing from inside a handler does not change what the running dispatch calls
+        self._handlers = {}
+        self.counts = Counter()
+
+    def subscribe(self, types: int | tuple[int, ...], handler: any, when: any = None) -> None:
+        """Call handler(event) for every event of types, only while when() is true if given."""
+        if when is not None:
+            handler = _Guarded(handler, when)
+        for event_type in dict.fromkeys((types,) if isinstance(types, int) else types):
+            self._handlers[event_type] = self._handlers.get(event_type, ()) + (handler,)
+
+    def unsubscribe(self, types: int | tuple[int, ...], handler: any) -> None:
+        for event_type in (types,) if isinstance(types, int) else types:
+            handlers = tuple(subscribed for subscribed in self._handlers.get(event_type, ())
+                             if subscribed != handler)
+            if handlers:
+                self._handlers[event_type] = handlers
+            else:
+                self._handlers.pop(event_type, None)
+
+    def dispatch(self, event: any) -> None:
+        self.counts[event.type] += 1
+        for handler in self._handlers.get(event.type, ()):
+            handler(event)
+
+    def handlers(self, event_type: int) -> tuple:
+        return self._handlers.get(event_type, ())
+
+    def clear(self) -> None:
+        self._handlers.clear()
+        self.counts.clear()
+
+    def report(self, names: dict[int, str] = None) -> str:
+        names = names or {}
+        lines = [f"Dispatched {sum(self.counts.values())} events"]
+        for event_type, count in self.counts.most_common():
+            name = names.get(event_type, str(event_type))
+            lines.append(f"  {count:8d}  {name} ({len(self.handlers(event_type))} handlers)")
+        return '\n'.join(lines)
+
+
+class _Guarded:
+    """A handler that is skipped while when() is false. Equal to the handler it wraps, so it can be unsubscribed."""
+    __slots__ = ('handler', 'when')
+
+    def __init__(self, handler: any, when: any):
+        self.handler = handler
+        self.when = when
+
+    def __call__(self, event: any) -> None:
+        if self.when():
+            self.handler(event)
+
+    def __eq__(self, other: any) -> bool:
+        return self.handler == (other.handler if isinstance(other, _Guarded) else other)
+
+    def __hash__(self):
+        return hash(self.handler)
@@ -1,7 +1,11 @@
 import pygame
+from .assets import scale_by
 
 
 class Button:
+    # The event types tick() does anything with
+    EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
     def __init__(self, base: pygame.Rect | pygame.surface.Surface,
                  pos: tuple[int, int],
                  activate: any = None,
@@ -25,7 +29,7 @@ class Button:
         self.active = False
 
     def resize(self, pos: tuple[int, int], scale: float = 1):
-        self.base = pygame.transform.scale_by(self._base, scale)
+        self.base = scale_by(self._base, scale)
         if type(self.base) == pygame.Rect:
             self.rect = self.base
             self.surface = None
@@ -36,7 +40,10 @@ class Button:
 
     def change_surface(self, surface: pygame.surface.Surface):
         self._base = surface
-        self.surface = pygame.transform.scale(surface, self.rect.size)
+        if surface.get_size() == self.rect.size:
+            self.surface = surface
+        else:
+            self.surface = pygame.transform.scale(surface, self.rect.size)
 
     def check_type(self, action: any):
         if type(action) == pygame.event.Event:
@@ -64,6 +71,8 @@ class Button:
 
 
 class Flick(Button):
+    EVENTS = (pygame.MOUSEMOTION,)
+
     def __init__(self, base: pygame.Rect | pygame.surface.Surface,
                  pos: tuple[int, int] = None,
                  activate: any = None,
@@ -103,6 +112,8 @@ class Flick(Button):
 
 
 class ToggleButton(Button):
+    EVENTS = (pygame.MOUSEBUTTONDOWN,)
+
     def __init__(self, base: pygame.Rect | pygame.surface.Surface,
                  pos: tuple[int, int],
                  activate: any = None,
@@ -1,31 +1,36 @@
 from data.game.constants import *
+from data.game.timing import HOUR_DURATION
+from .assets import render_text
+from .resolution import logical, logical_font
+from .scheduler import scheduler
 
 
 class Clock:
+    EVENTS = (CLOCK,)
+    HOUR_DURATION = HOUR_DURATION
+
     def __init__(self):
-        self.HOUR_FONT = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 100)
-        self.NIGHT_FONT = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 50)
+        self.HOUR_FONT = logical_font('resources/fonts/five-nights-at-freddys.ttf', 100)
+        self.NIGHT_FONT = logical_font('resources/fonts/five-nights-at-freddys.ttf', 50)
 
         self.night = None
-        self.HOUR_DURATION = None
         self.time = None
         self.hour = None
         self.active = None
 
     def start(self, night):
-        self.HOUR_DURATION = 60
         self.time = 12
         self.hour = 0
         self.active = True
         self.night = night
 
-        pygame.time.set_timer(CLOCK, self.HOUR_DURATION * 1000)
+        scheduler.set_timer(CLOCK, self.HOUR_DURATION * 1000)
 
     def stop(self):
         self.night = 0
         self.hour = 0
         self.time = 12
-        pygame.time.set_timer(CLOCK, 0)
+        scheduler.set_timer(CLOCK, 0)
 
     def tick(self, event: pygame.event.Event):
         if event.type == CLOCK:
@@ -33,13 +38,13 @@ class Clock:
 
     def draw(self, screen: pygame.Surface):
         width = screen.get_width()
-        render = self.HOUR_FONT.render(f"{self.time} AM", True, 'white')
+        render = render_text(self.HOUR_FONT, f"{self.time} AM", True, 'white')
         rect = render.get_rect()
-        rect.topright = (width - 15, 15)
+        rect.topright = (width - logical(15), logical(15))
         screen.blit(render, rect)
-        night = self.NIGHT_FONT.render(f"Night {self.night}", True, 'white')
+        night = render_text(self.NIGHT_FONT, f"Night {self.night}", True, 'white')
         night_rect = night.get_rect()
-        night_rect.topright = (width - 15, rect.height - 5)
+        night_rect.topright = (width - logical(15), rect.height - logical(5))
         screen.blit(night, night_rect)
 
     def update_time(self):
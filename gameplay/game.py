@@ -4,84 +4,132 @@ from gameplay.office import Office
 from gameplay.systems import Cameras
 from gameplay.power import PowerManager
 from gameplay.buttons import *
+from gameplay.assets import cache, load_sound, render_text
+from gameplay.atlas import TextureAtlas
+from gameplay.resolution import logical, logical_pos, logical_rect, logical_font
 from gameplay import Bonnie, Chica, Lefty, Knight, Garble
+from gameplay.animation import StaticGenerator
+from gameplay.audio import CRITICAL, HIGH, LOW, MusicStream, mixer, play
+from gameplay.render import DirtyRenderer
+from gameplay.bus import EventBus
+from gameplay.scheduler import scheduler
 from data.game.constants import *
 import json
 from data.saves.save import SaveManager
 import random
 import os
+from contextlib import nullcontext
 
 
 def create_phone_calls(path: str):
     phone_calls = []
     for i in range(10):
-        try:
-            phone_calls.append(pygame.mixer.Sound(path + str(i + 1) + '.mp3'))
-        except FileNotFoundError:
+        if os.path.isfile(path + str(i + 1) + '.mp3'):
+            phone_calls.append(MusicStream(path + str(i + 1) + '.mp3', bus='voice'))
+        else:
             phone_calls.append(None)
     return phone_calls
 
 
 def create_mute_call() -> pygame.Surface:
-    font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 50)
-    surface = pygame.Surface((200, 50))
-    base = pygame.rect.Rect(0, 0, 200, 50)
+    font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 50)
+    base = logical_rect(0, 0, 200, 50)
+    surface = pygame.Surface(base.size)
     text = font.render('Mute Call', True, 'white')
     text_rect = text.get_rect()
-    text_rect.center = (100, 30)
-    pygame.draw.rect(surface, 'white', base, 5, 5)
-    base_rect = pygame.Surface((200, 50))
-    pygame.draw.rect(base_rect, (200, 200, 200), pygame.Rect(0, 0, 200, 50), border_radius=5)
+    text_rect.center = logical_pos(100, 30)
+    pygame.draw.rect(surface, 'white', base, int(logical(5)), int(logical(5)))
+    base_rect = pygame.Surface(base.size)
+    pygame.draw.rect(base_rect, (200, 200, 200), base, border_radius=int(logical(5)))
     base_rect.set_alpha(200)
     surface.blit(base_rect, (0, 0))
     surface.blit(text, text_rect)
+    cache.release(font)
     return surface
 
 
 def init_flick(image: pygame.surface.Surface):
     screen = pygame.display.get_surface()
     camera_flick = Flick(image,
-                         (int(screen.get_width() * 4 / 11), screen.get_height() - 25),
+                         (int(screen.get_width() * 4 / 11), screen.get_height() - logical(25)),
                          pygame.event.Event(CAMERA_FLIPPED_UP),
                          pygame.event.Event(CAMERA_FLIPPED_DOWN),
                          draw_type='midbottom',
-                         scale=screen.get_width() / (screen.get_width() * 1.4))
+                         scale=logical(screen.get_width() / (screen.get_width() * 1.4)))
     return camera_flick
 
 
+class NullTrace:
+    """Stands in for profiler.StartupTrace when nothing is being traced."""
+    @staticmethod
+    def phase(name: str):
+        return nullcontext()
+
+
 class Game:
-    def __init__(self):
+    # What tick() handles, global_events() has its own
+    EVENTS = (MUTE_TIME, pygame.KEYDOWN, GAME_TIMER, UPDATE_POWER, KILL, WIN, POWER_RESET,
+              CAMERA_FLIPPED_UP, CAMERA_FLIPPED_DOWN) + Button.EVENTS
+    GLOBAL_EVENTS = (pygame.WINDOWRESIZED, pygame.WINDOWEXPOSED, POWER_OUT, WIN, pygame.KEYDOWN, RANDOM_EVENT_SOUND)
+
+    def __init__(self, lazy: bool = False, dirty_rects: bool = False, backend: any = None, trace: any = None):
+        self.dirty_rects = dirty_rects
+        # Handed in by main.py, gameplay does not import the profiler itself
+        self.trace = trace or NullTrace()
+        self.bus = EventBus()
+        # Draws into this instead of the display surface when set, see gameplay.backend
+        self.backend = backend
+        self.renderer = None
+        self.loaded = False
+        self._loading = self.load()
+        if not lazy:
+            self.finish_loading()
+
+    def load(self):
+        """
+        Builds everything the game needs, yielding between the expensive parts
+        so the work can be spread over idle frames of the main menu.
+        """
         # Loading Resources
-        self.phone_calls = create_phone_calls('resources/sounds/night_')
-        self.flick_up_image = pygame.image.load('resources/ui/buttons/flick_up.png').convert_alpha()
-        self.flick_down_image = pygame.image.load('resources/ui/buttons/flick_down.png').convert_alpha()
-        self.victory_sound = pygame.mixer.Sound('resources/sounds/five-nights-at-freddys-6-am.mp3')
-        self.jump_scare_sound = pygame.mixer.Sound('resources/sounds/jump_scare.mp3')
-        self.GLOBAL_FONT = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 55)
-        self.BIGGER_GLOBAL_FONT = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 65)
-        self.static_sound = pygame.mixer.Sound('resources/sounds/static.mp3')
-        self.cheer_sound = pygame.mixer.Sound('resources/sounds/cheer.mp3')
-        self.static_sound.set_volume(.2)
-        self.res = []
-        for i in range(0, 11):
-            sound = pygame.mixer.Sound('resources/sounds/res_' + str(i) + '.mp3')
-            sound.set_volume(.15)
-            self.res.append(sound)
-        self.static = []
-        for frame in os.listdir('resources/animations/static/'):
-            image = pygame.image.load(f'resources/animations/static/{frame}').convert_alpha()
-            surface = pygame.surface.Surface((1920, 1080))
-            surface.fill('black')
-            surface.blit(image, (0, 0))
-            self.static.append(surface)
+        with self.trace.phase('Game/resources'):
+            self.phone_calls = create_phone_calls('resources/sounds/night_')
+            self.flick_up_image = TextureAtlas.shared().get('flick_up')
+            self.flick_down_image = TextureAtlas.shared().get('flick_down')
+            self.victory_sound = MusicStream('resources/sounds/five-nights-at-freddys-6-am.mp3')
+            self.jump_scare_sound = load_sound('resources/sounds/jump_scare.mp3')
+            self.GLOBAL_FONT = logical_font('resources/fonts/five-nights-at-freddys.ttf', 55)
+            self.BIGGER_GLOBAL_FONT = logical_font('resources/fonts/five-nights-at-freddys.ttf', 65)
+            self.static_sound = load_sound('resources/sounds/static.mp3')
+            self.cheer_sound = load_sound('resources/sounds/cheer.mp3')
+            self.power_off_sound = cache.sound('resources/sounds/power_off.mp3')
+            self.static_sound.set_volume(.2)
+            self.res = []
+            for i in range(0, 11):
+                sound = load_sound('resources/sounds/res_' + str(i) + '.mp3')
+                sound.set_volume(.15)
+                self.res.append(sound)
+        yield
+        static = StaticGenerator.shared(lazy=True)
+        yield from self._traced('Game/static', static.load())
+        self.static = static
 
         # Initialize Managers and Systems
         self.save_manager = SaveManager()
-        self.power_manager = PowerManager()
-        self.clock = Clock()
-
-        self.systems = {"Cameras": Cameras()}
-        self.office = Office(self)
+        with self.trace.phase('Game/PowerManager'):
+            self.power_manager = PowerManager()
+        with self.trace.phase('Game/Clock'):
+            self.clock = Clock()
+        yield
+
+        # Both load an image per step, a whole one at once would stall a menu frame for hundreds of milliseconds
+        with self.trace.phase('Game/Cameras'):
+            cameras = Cameras(lazy=True)
+        yield from self._traced('Game/Cameras', cameras.load())
+        self.systems = {"Cameras": cameras}
+        with self.trace.phase('Game/Office'):
+            office = Office(self, lazy=True)
+        yield from self._traced('Game/Office', office.load())
+        self.office = office
 
         with open('data/game/nights.json', 'r') as f:
             self.night_dict = json.loads(f.read())
@@ -89,7 +137,9 @@ class Game:
         self.animatronics = []
         animatronic_key = {"Bonnie": Bonnie, "Chica": Chica, "Lefty": Lefty, "Knight": Knight, "Garble": Garble}
         for name, clas in animatronic_key.items():
-            self.animatronics.append(clas(self))
+            with self.trace.phase(f'Game/{name}'):
+                self.animatronics.append(clas(self))
+            yield
 
         # Initialize Animatronics
 
@@ -114,6 +164,30 @@ class Game:
 
         self.jump_scare_sound.set_volume(0.3)
         self.flick = init_flick(self.flick_up_image)
+        if self.dirty_rects and self.backend is None:
+            self.renderer = DirtyRenderer(self)
+        self.subscribe()
+        self.loaded = True
+
+    def _traced(self, name: str, steps: any):
+        """Runs the steps of another load() generator, yielding after each, every step traced as name."""
+        done = object()
+        while True:
+            with self.trace.phase(name):
+                step = next(steps, done)
+            if step is done:
+                return
+            yield
+
+    def warm_up(self) -> bool:
+        """Runs the next loading step. Returns True once the game is fully built."""
+        if not self.loaded:
+            next(self._loading, None)
+        return self.loaded
+
+    def finish_loading(self):
+        for _ in self._loading:
+            pass
 
     def start(self):
         self.save_manager.load_data()
@@ -134,6 +208,9 @@ class Game:
         self.power_out_stage = 0
         self.power_out_counter = 0
         self.global_volume = self.save_manager.data['volume']/100
+        mixer.set_volume('master', self.global_volume)
+        if self.renderer is not None:
+            self.renderer.reset()
 
         if self.save_manager.data['night'] == 0:
             self.save_manager.data['night'] = 1
@@ -157,20 +234,22 @@ class Game:
             animatronic.start()
 
         # Start Phone
-        pygame.time.set_timer(MUTE_TIME, 2500)
+        scheduler.set_timer(MUTE_TIME, 2500)
         if self.phone_calls[self.night - 1] is not None:
             self.phone_call = self.phone_calls[self.night - 1]
-            pygame.mixer.find_channel(True).play(self.phone_call)
+            self.phone_call.play()
             self.mute_button = 'start'
 
-        pygame.time.set_timer(RANDOM_EVENT_SOUND, random.randint(5000, 15000), 1)
+        scheduler.set_timer(RANDOM_EVENT_SOUND, random.randint(5000, 15000), 1)
 
     def stop(self):
-        pygame.time.set_timer(MUTE_TIME, 0)
-        pygame.time.set_timer(GAME_TIMER, 0)
-        pygame.time.set_timer(POWER_RESET, 0)
+        scheduler.set_timer(MUTE_TIME, 0)
+        scheduler.set_timer(GAME_TIMER, 0)
+        scheduler.set_timer(POWER_RESET, 0)
 
         pygame.mixer.stop()
+        if self.phone_call is not None:
+            self.phone_call.stop()
         self.office.stop()
         self.save_manager.save_game()
         self.power_manager.stop()
@@ -190,36 +269,54 @@ class Game:
             if random.randint(1, 5) == 5 or self.power_out_counter == 4:
                 self.power_out_counter = 0
                 self.power_out_stage = 2
-                pygame.time.set_timer(POWER_OUT, 2000, 1)
-                self.cheer_sound.play()
+                scheduler.set_timer(POWER_OUT, 2000, 1)
+                play(self.cheer_sound)
             else:
                 self.power_out_counter += 1
-                pygame.time.set_timer(POWER_OUT, 5000, 1)
+                scheduler.set_timer(POWER_OUT, 5000, 1)
         elif self.power_out_stage == 2:
             if random.randint(1, 5) == 5 or self.power_out_counter == 4:
                 self.power_out_counter = 0
                 self.power_out_stage = 3
                 self.cheer_sound.stop()
                 self.office.set_black()
-                pygame.time.set_timer(POWER_OUT, 2000, 1)
+                scheduler.set_timer(POWER_OUT, 2000, 1)
             else:
                 self.power_out_counter += 1
-                pygame.time.set_timer(POWER_OUT, 5000, 1)
+                scheduler.set_timer(POWER_OUT, 5000, 1)
         elif self.power_out_stage == 3:
             if random.randint(1, 5) == 5:
                 pygame.event.post(pygame.event.Event(KILL, {'animation': self.animatronics[3].jumpscare}))
             else:
-                pygame.time.set_timer(pygame.event.Event(POWER_OUT), 2000, 1)
+                scheduler.set_timer(pygame.event.Event(POWER_OUT), 2000, 1)
         else:
             self.power_out()
 
+    def subscribe(self):
+        """Subscribes everything to the events it handles, in the order they always got them."""
+        bus = self.bus
+        bus.subscribe(self.GLOBAL_EVENTS, self.global_events)
+        for system in self.systems.values():
+            bus.subscribe(system.EVENTS, system.tick)
+        for animatronic in self.animatronics:
+            bus.subscribe(animatronic.events, animatronic.tick, when=self.powered)
+        bus.subscribe(self.flick.EVENTS, self.flick.tick, when=lambda: not self.blacked_out)
+        bus.subscribe(self.office.EVENTS, self.office.tick)
+        bus.subscribe(self.EVENTS, self.tick)
+        bus.subscribe(self.clock.EVENTS, self.clock.tick)
+        bus.subscribe(self.power_manager.EVENTS, self.power_manager.tick)
+        bus.subscribe(CLOCK, self.hour_changed)
+
+    def powered(self) -> bool:
+        return not self.power_out_stage > 0
+
     def global_tick(self, event: pygame.event.Event):
-        for i in range(pygame.mixer.get_num_channels()):
-            pygame.mixer.Channel(i).set_volume(self.global_volume)
-        if event.type == pygame.WINDOWRESIZED:
-            for system in self.systems.values():
-                system.resize()
-            self.power_manager.resize()
+        self.bus.dispatch(event)
+
+    def global_events(self, event: pygame.event.Event):
+        # The render target never changes size, resizing the window only changes how SDL scales it
+        if event.type in (pygame.WINDOWRESIZED, pygame.WINDOWEXPOSED) and self.renderer is not None:
+            self.renderer.reset()
         if event.type == POWER_OUT:
             self.power_out_sequence()
         if event.type == WIN:
@@ -236,38 +333,83 @@ class Game:
         if event.type == RANDOM_EVENT_SOUND:
             if not self.blacked_out and self.status == 'playing':
                 sound = random.choice(self.res)
-                pygame.time.set_timer(RANDOM_EVENT_SOUND, int(sound.get_length() * 1000) + random.randint(5000, 15000), 1)
-                sound.play()
+                scheduler.set_timer(RANDOM_EVENT_SOUND, int(sound.get_length() * 1000) + random.randint(5000, 15000), 1)
+                play(sound, priority=LOW)
 
-        for system in self.systems.values():
-            system.tick(event)
-        if not self.power_out_stage > 0:
-            for animatronic in self.animatronics:
-                animatronic.tick(event)
-        if not self.blacked_out:
-            self.flick.tick(event)
-        self.office.tick(event)
-        self.tick(event)
-        self.clock.tick(event)
-        self.power_manager.tick(event)
-        if event.type == CLOCK:
-            for animatronic in self.animatronics:
-                change_list = self.night_data['animatronics'][animatronic.name]['change']
-                for change in change_list:
-                    if change[0] == self.clock.hour:
-                        animatronic.update_aggression(change[1])
-                        break
+    def hour_changed(self, event: pygame.event.Event):
+        for animatronic in self.animatronics:
+            change_list = self.night_data['animatronics'][animatronic.name]['change']
+            for change in change_list:
+                if change[0] == self.clock.hour:
+                    animatronic.update_aggression(change[1])
+                    break
 
     def global_draw(self):
-        screen = pygame.display.get_surface()
-        self.office.draw()
+        self.update_scene()
+        self.draw(pygame.display.get_surface())
+
+    def render(self) -> list[pygame.Rect] | None:
+        """Draws a frame, through the dirty rect renderer when there is one. Returns the rects to update."""
+        if self.backend is not None:
+            self.update_scene()
+            self.backend.clear()
+            self.draw(self.backend)
+            return None
+        if self.renderer is None:
+            self.global_draw()
+            return None
+        return self.renderer.draw()
+
+    def update(self):
+        """Everything that is checked every frame rather than on an event."""
+        if self.powered():
+            for animatronic in self.animatronics:
+                animatronic.update()
+
+    def update_scene(self):
+        self.update()
+        self.office.update()
+        for system in self.systems.values():
+            system.update()
+        if self.blacked_out:
+            self.power_manager.update_reset(self.reset_counter, self.reset_time)
+        if self.power_out_stage == 2:
+            if random.randint(0, 1):
+                self.office.set_knight()
+            else:
+                self.office.set_regular()
+
+    def scene_signature(self) -> tuple | None:
+        """What the office view looks like this frame, None while something on it is animating."""
+        cameras = self.systems['Cameras']
+        if self.status != 'playing' or self.kill_anim is not None or cameras.active or cameras.animation.active:
+            return None
+        doors = []
+        for door in self.office.doors:
+            if door.animator.active:
+                return None
+            doors.append(id(door.current_surface))
+        return (self.office.active, self.office.rot_x, id(self.office.image), tuple(doors),
+                id(self.flick.surface), self.blacked_out)
+
+    def draw_scene(self, screen: pygame.Surface):
+        self.office.render(screen)
         for system in self.systems.values():
-            system.draw()
+            system.render(screen)
         if not self.blacked_out:
             self.flick.draw(screen)
+
+    def draw_power(self, screen: pygame.Surface):
+        if not self.blacked_out:
+            self.power_manager.draw(screen)
+        else:
+            self.power_manager.draw_reset(screen, self.reset_counter, self.reset_time)
+
+    def draw(self, screen: pygame.Surface):
+        self.draw_scene(screen)
         if self.status == 'win':
             screen.fill('black')
-            text = pygame.transform.scale_by(self.BIGGER_GLOBAL_FONT.render("6:00 AM", True, "white"), 3)
+            text = pygame.transform.scale_by(render_text(self.BIGGER_GLOBAL_FONT, "6:00 AM", True, "white"), 3)
             rect = text.get_rect()
             rect.center = (screen.get_width() / 2, screen.get_height() / 2)
             screen.blit(text, rect)
@@ -275,27 +417,19 @@ class Game:
             self.clock.draw(screen)
         if self.mute_button is not None and self.mute_button != 'start':
             self.mute_button.draw(screen)
-        if not self.blacked_out:
-            self.power_manager.draw(screen)
-        else:
-            self.power_manager.draw_reset(screen, self.reset_counter, self.reset_time)
+        self.draw_power(screen)
 
         if self.kill_anim is not None:
             self.kill_anim.draw(screen)
-        if self.power_out_stage == 2:
-            if random.randint(0, 1):
-                self.office.set_knight()
-            else:
-                self.office.set_regular()
         if self.status == 'static':
-            screen.blit(random.choice(self.static), (0, 0))
+            self.static.draw(screen, background='black')
 
     def tick(self, event: pygame.event.Event):
         if event.type == MUTE_TIME:
             if self.mute_button == 'start':
-                self.mute_button = Button(create_mute_call(), (20, 20),
+                self.mute_button = Button(create_mute_call(), logical_pos(20, 20),
                                           activate=self.mute_call)
-                pygame.time.set_timer(MUTE_TIME, 10000)
+                scheduler.set_timer(MUTE_TIME, 10000)
             else:
                 self.mute_button = None
         if event.type == pygame.KEYDOWN:
@@ -305,10 +439,10 @@ class Game:
                 pygame.event.post(pygame.event.Event(MENU_CHANGE, {'func': 'menu'}))
         if event.type == GAME_TIMER:
             if self.status == 'killed':
-                self.static_sound.play()
+                play(self.static_sound, priority=HIGH)
                 self.static_sound.fadeout(2000)
                 self.status = 'static'
-                pygame.time.set_timer(GAME_TIMER, 2000)
+                scheduler.set_timer(GAME_TIMER, 2000)
             elif self.status == 'static':
                 pygame.event.post(pygame.event.Event(MENU_CHANGE, {'func': 'menu'}))
             else:
@@ -361,9 +495,9 @@ class Game:
         pygame.mixer.stop()
         self.stop()
         self.status = 'killed'
-        self.jump_scare_sound.play(maxtime=1000)
-        pygame.time.set_timer(KILL, 0)
-        pygame.time.set_timer(GAME_TIMER, 1000)
+        play(self.jump_scare_sound, priority=CRITICAL, maxtime=1000)
+        scheduler.set_timer(KILL, 0)
+        scheduler.set_timer(GAME_TIMER, 1000)
 
     def win(self):
         pygame.mixer.stop()
@@ -371,7 +505,7 @@ class Game:
         self.stop()
         self.status = 'win'
         self.victory_sound.play(fade_ms=1000)
-        pygame.time.set_timer(GAME_TIMER, int(self.victory_sound.get_length() * 1000) - 1000)
+        scheduler.set_timer(GAME_TIMER, int(self.victory_sound.get_length() * 1000) - 1000)
 
     def update_animatronics(self):
         for animatronic in self.animatronics:
@@ -386,7 +520,7 @@ class Game:
         # the possibility of even activating any of the other systems like removing the flick button.
         self.black_out()
         self.reset_time = 150
-        pygame.time.set_timer(POWER_RESET, 100, self.reset_time + 1)
+        scheduler.set_timer(POWER_RESET, 100, self.reset_time + 1)
         # wait 10 - 30 seconds
         # bright office
 
@@ -397,10 +531,10 @@ class Game:
         self.office.reset()
         self.blacked_out = False
         self.update_animatronics()
-        pygame.time.set_timer(RANDOM_EVENT_SOUND, random.randint(5000, 15000), 1)
+        scheduler.set_timer(RANDOM_EVENT_SOUND, random.randint(5000, 15000), 1)
 
     def black_out(self):
-        pygame.mixer.Sound('resources/sounds/power_off.mp3').play()
+        play(self.power_off_sound, priority=HIGH)
         for sound in self.res:
             sound.stop()
         self.blacked_out = True
@@ -410,4 +544,4 @@ class Game:
     def power_out(self):
         self.black_out()
         self.power_out_stage = 1
-        pygame.time.set_timer(POWER_OUT, random.randint(0000, 5000), 1)
+        scheduler.set_timer(POWER_OUT, random.randint(0000, 5000), 1)
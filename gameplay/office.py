@@ -2,34 +2,57 @@ import random
 from data.game.constants import *
 from .buttons import *
 from .animation import Animator
+from .assets import cache, load_sound
+from .atlas import TextureAtlas
+from .audio import HIGH, play
+from .scaled import image_size, load_scaled
+from .resolution import logical, logical_pos
 import json
 
 
 class Office:
-    def __init__(self, game):
-        self.ambience = pygame.mixer.Sound('resources/sounds/office_ambience.mp3')
-        self.camera_toggle_sound = pygame.mixer.Sound('resources/sounds/camera_pull.mp3')
-        self.image = pygame.image.load('resources/backgrounds/office.png').convert()
-        self.blackout_image = pygame.image.load('resources/backgrounds/office_blackout.png').convert()
-        self.knight_blackout = pygame.image.load('resources/backgrounds/knight_blackout.png')
-        self.drone_noise = pygame.mixer.Sound('resources/sounds/drone_noise.mp3')
-        self.doors = Door.generate_doors()
-        self.image = pygame.transform.scale_by(self.image,
-                                               pygame.display.get_surface().get_height()/self.image.get_size()[1])
-        self._image = self.image.copy()
+    EVENTS = (CAMERA_FLIPPED_UP, CAMERA_FLIPPED_DOWN) + Button.EVENTS
+
+    def __init__(self, game, lazy: bool = False):
+        self.ambience = load_sound('resources/sounds/office_ambience.mp3')
+        self.camera_toggle_sound = load_sound('resources/sounds/camera_pull.mp3')
+        self.drone_noise = load_sound('resources/sounds/drone_noise.mp3')
+        self.image = None
+        self.blackout_image = None
+        self.knight_blackout = None
+        self.doors = Door.generate_doors(lazy=True)
+        self._image = None
 
         # Eventually Change the surface to be a rect
         self.power_reset_button = Button(
-            pygame.image.load('resources/ui/buttons/reset_button.png').convert_alpha(),
-            (0, 570), activate=pygame.event.Event(POWER_RESET))
+            TextureAtlas.shared().get('reset_button'),
+            logical_pos(0, 570), activate=pygame.event.Event(POWER_RESET), scale=logical(1))
 
-        self.surface = pygame.surface.Surface(self.image.get_size())
+        # The part of the office image that is on screen, moved across it to pan instead of moving the image
+        self.view = pygame.Rect((0, 0), pygame.display.get_surface().get_size())
         self.game = game
 
         self.MAX_ROTATION = None
         self.rot_x = None
         self.active = None
         self._locked = None
+        if not lazy:
+            for _ in self.load():
+                pass
+
+    def load(self):
+        """Loads the images one at a time, yielding after each so Game can spread them over frames."""
+        office = 'resources/backgrounds/office.png'
+        scalar = pygame.display.get_surface().get_height()/image_size(office)[1]
+        self.image = load_scaled(office, scalar, alpha=False)
+        self._image = self.image.copy()
+        yield
+        self.blackout_image = load_scaled('resources/backgrounds/office_blackout.png', scalar, alpha=False)
+        yield
+        self.knight_blackout = load_scaled('resources/backgrounds/knight_blackout.png', scalar, alpha=False)
+        yield
+        for door in self.doors:
+            yield from door.load()
 
     def start(self):
         self.drone_noise.set_volume(.2)
@@ -58,27 +81,36 @@ class Office:
             self.drone_noise.set_volume(.1)
             self.active = False
             self.ambience.set_volume(.1)
-            self.camera_toggle_sound.play()
+            play(self.camera_toggle_sound)
         if event.type == CAMERA_FLIPPED_DOWN:
             self.drone_noise.set_volume(.2)
             self.active = True
             self.ambience.set_volume(.2)
-            self.camera_toggle_sound.play()
+            play(self.camera_toggle_sound)
 
     def draw(self):
+        self.update()
+        self.render(pygame.display.get_surface())
+
+    def update(self):
         if self.active:
             self.rot_x += self.get_rot_from_mouse(pygame.mouse.get_pos())
             self.rot_x = max(-self.MAX_ROTATION, self.rot_x)
             self.rot_x = min(self.MAX_ROTATION, self.rot_x)
 
-            screen = pygame.display.get_surface()
-            self.surface.blit(self.image, (0, 0))
-            pos = self.get_pos_from_rot()
-            screen.blit(self.surface, (pos, 0))
-            self.power_reset_button.rect.x = 1355 + pos
+            pos = self.scroll()
+            self.power_reset_button.rect.x = logical(1355) + pos
+            if not self.game.blacked_out:
+                for door in self.doors:
+                    door.update(pygame.Vector2(pos, 0))
+
+    def render(self, screen: pygame.Surface):
+        if self.active:
+            pos = self.scroll()
+            screen.blit(self.image, (0, 0), self.view)
             if not self.game.blacked_out:
                 for door in self.doors:
-                    door.draw(screen, pygame.Vector2(pos, 0))
+                    door.render(screen, pygame.Vector2(pos, 0))
                 self.power_reset_button.draw(screen)
 
     def blackout(self):
@@ -92,7 +124,7 @@ class Office:
         self.image = self.blackout_image
 
     def set_black(self):
-        surface = pygame.surface.Surface((2000, 1080))
+        surface = pygame.surface.Surface((int(logical(2000)), pygame.display.get_surface().get_height()))
         surface.fill("black")
         self.image = surface
 
@@ -104,7 +136,7 @@ class Office:
         for door in self.doors:
             door.reset()
         # self.ambience.play()
-        self.drone_noise.play(10000)
+        play(self.drone_noise, 'ambience', loops=10000)
 
     def get_power_usage(self):
         power_usage = 0
@@ -115,39 +147,65 @@ class Office:
                 power_usage += 1
         return power_usage
 
-    @staticmethod
-    def get_rot_from_mouse(mouse_pos):
+    def get_rot_from_mouse(self, mouse_pos):
         mouse_x, _ = mouse_pos
-        screen_x, _ = pygame.display.get_surface().get_size()
+        screen_x = self.view.width
         normalized = (2 * mouse_x/screen_x - 1)
         if screen_x * 3/7 > mouse_x or mouse_x > screen_x * 4/7:
             return normalized * 10
         return 0
 
     def get_pos_from_rot(self):
-        screen_x, _ = pygame.display.get_surface().get_size()
-        image_x, _ = self.image.get_size()
+        screen_x = self.view.width
+        image_x = self.image.get_width()
         # normalization 0-1
         normalized = (self.rot_x + self.MAX_ROTATION)/(2*self.MAX_ROTATION)
 
         # turn into other stuff
         return normalized * (screen_x - image_x)
 
+    def scroll(self) -> float:
+        """Moves the view to where the office is turned, returns where the image's left edge is on screen."""
+        pos = self.get_pos_from_rot()
+        # Blitting at pos would truncate it the same way
+        self.view.x = -int(pos)
+        return pos
+
 
 class Door:
-    def __init__(self, image_paths: dict[str], positions: dict):
-        self.light_off_sound = pygame.mixer.Sound('resources/sounds/light_stuck.mp3')
-        self.light_on_sound = pygame.mixer.Sound('resources/sounds/light_button.mp3')
-        self.door_toggle_sound = pygame.mixer.Sound('resources/sounds/door_close.mp3')
-        self.light_noise = pygame.mixer.Sound('resources/sounds/light_noise.mp3')
-        self.stinger_sound = pygame.mixer.Sound('resources/sounds/stinger.mp3')
-        self.button_fail_sound = pygame.mixer.Sound('resources/sounds/light_stuck.mp3')
-        self._default_images = {key: pygame.image.load(value).convert_alpha() for key, value in image_paths.items()}
-
-        scalar = pygame.display.get_surface().get_height()/self._default_images['open_dark'].get_size()[1]
-        for key, image in self._default_images.items():
-            self._default_images[key] = pygame.transform.scale_by(image, scalar)
+    def __init__(self, image_paths: dict[str], positions: dict, lazy: bool = False):
+        self.light_off_sound = cache.sound('resources/sounds/light_stuck.mp3')
+        self.light_on_sound = load_sound('resources/sounds/light_button.mp3')
+        self.door_toggle_sound = load_sound('resources/sounds/door_close.mp3')
+        self.light_noise = load_sound('resources/sounds/light_noise.mp3')
+        self.stinger_sound = load_sound('resources/sounds/stinger.mp3')
+        self.button_fail_sound = cache.sound('resources/sounds/light_stuck.mp3')
+        self.image_paths = image_paths
+        self._default_images = {}
         self.relative_pos = positions
+        self.curr_images = None
+        self.light_button = None
+        self.door_button = None
+
+        self.door_toggle_sound.set_volume(.5)
+
+        self.stung = None
+        self.light_status = None
+        self.door_status = None
+        self.flicker_counter = None
+        self.current_surface = None
+        self.rect = None
+        self.animator = None
+        if not lazy:
+            for _ in self.load():
+                pass
+
+    def load(self):
+        """Loads the images one at a time, yielding after each."""
+        scalar = pygame.display.get_surface().get_height()/image_size(self.image_paths['open_dark'])[1]
+        for key, value in self.image_paths.items():
+            self._default_images[key] = load_scaled(value, scalar)
+            yield
         self.curr_images = self._default_images.copy()
 
         self.light_button = ToggleButton(self.curr_images['button'],
@@ -160,16 +218,6 @@ class Door:
                                         self.close_door,
                                         self.open_door)
 
-        self.door_toggle_sound.set_volume(.5)
-
-        self.stung = None
-        self.light_status = None
-        self.door_status = None
-        self.flicker_counter = None
-        self.current_surface = None
-        self.rect = None
-        self.animator = None
-
     def start(self):
         self.light_button.activate, self.light_button.deactivate = self.light_on, self.light_off
         self.door_button.activate, self.door_button.deactivate = self.close_door, self.open_door
@@ -198,21 +246,28 @@ class Door:
         self.light_button.tick(event)
 
     def draw(self, surface: pygame.Surface, vector: pygame.Vector2):
+        self.update(vector)
+        self.render(surface, vector)
+
+    def update(self, vector: pygame.Vector2):
         if not self.animator.active:
             light = self.get_flicker()
             self.current_surface = self.curr_images[f"{self.door_status}_{light}"]
             light_positions = self.relative_pos['light']
 
-            door_positions = self.relative_pos['door']
-
             button_positions = self.relative_pos['button']
             self.rect.topleft = (0, 0)
             self.rect.move_ip(vector)
 
-            surface.blit(self.current_surface, (self.rect.x + door_positions[0], self.rect.y + door_positions[1]))
+            self.door_button.resize((self.rect.x + button_positions[0], self.rect.y + button_positions[1]),
+                                    scale=logical(1.2))
+            self.light_button.resize((self.rect.x + light_positions[0], self.rect.y + light_positions[1]),
+                                     scale=logical(1.2))
 
-            self.door_button.resize((self.rect.x + button_positions[0], self.rect.y + button_positions[1]), scale=1.2)
-            self.light_button.resize((self.rect.x + light_positions[0], self.rect.y + light_positions[1]), scale=1.2)
+    def render(self, surface: pygame.Surface, vector: pygame.Vector2):
+        if not self.animator.active:
+            door_positions = self.relative_pos['door']
+            surface.blit(self.current_surface, (self.rect.x + door_positions[0], self.rect.y + door_positions[1]))
         self.animator.draw(surface, vector)
 
     def blackout(self):
@@ -223,28 +278,32 @@ class Door:
             self.light_off()
             self.light_button.active = False
 
+    def occupied(self) -> bool:
+        """Whether something is standing at the door, which is what the light shows."""
+        return self._default_images != self.curr_images
+
     def check_stinger(self):
-        if self._default_images != self.curr_images:
+        if self.occupied():
             if not self.stung:
                 self.stinger()
         else:
             self.stung = False
 
     def stinger(self):
-        self.stinger_sound.play(maxtime=2000)
+        play(self.stinger_sound, priority=HIGH, maxtime=2000)
         self.stung = True
 
     def reset(self):
         self.curr_images = self._default_images.copy()
 
     @classmethod
-    def generate_doors(cls) -> list:
+    def generate_doors(cls, lazy: bool = False) -> list:
         door_list = []
         with open('data/game/office.json', 'r') as f:
             dictionary = json.loads(f.read())
             for door in dictionary['doors']:
                 door_list.append(Door(door['images'], {
-                    k: tuple(v) for k, v in door['positions'].items()}))
+                    k: logical_pos(*v) for k, v in door['positions'].items()}, lazy))
         return door_list
 
     def get_flicker(self):
@@ -263,7 +322,7 @@ class Door:
             elif self.flicker_counter < 0:
                 if random.randint(-10, self.flicker_counter) <= -8:
                     self.flicker_counter = 1
-                    pygame.mixer.find_channel(True).play(self.light_noise, loops=100)
+                    play(self.light_noise, 'sfx', loops=100)
                     return 'light'
                 else:
                     return 'dark'
@@ -271,34 +330,34 @@ class Door:
 
     def lock(self):
         def fail():
-            pygame.mixer.find_channel(True).play(self.button_fail_sound)
+            play(self.button_fail_sound)
         self.door_button.activate = fail
         self.light_button.activate = fail
         self.door_button.deactivate = fail
         self.light_button.deactivate = fail
 
     def light_on(self):
-        pygame.mixer.find_channel(True).play(self.light_noise, loops=100)
-        pygame.mixer.find_channel(True).play(self.light_on_sound)
+        play(self.light_noise, 'sfx', loops=100)
+        play(self.light_on_sound)
         self.light_status = 'light'
         self.check_stinger()
 
     def light_off(self):
         self.light_noise.stop()
-        pygame.mixer.find_channel(True).play(self.light_off_sound)
+        play(self.light_off_sound)
         self.light_status = 'dark'
 
     def get_status(self):
         return f"{self.door_status}_{self.light_status}"
 
     def open_door(self):
-        pygame.mixer.find_channel(True).play(self.door_toggle_sound)
+        play(self.door_toggle_sound)
         self.animator.play_backward()
         self.door_status = 'open'
         self.current_surface = self.curr_images[f"open_{self.light_status}"]
 
     def close_door(self):
-        pygame.mixer.find_channel(True).play(self.door_toggle_sound)
+        play(self.door_toggle_sound)
         self.animator.play_forward()
         self.door_status = 'closed'
         self.current_surface = self.curr_images[f"closed_{self.light_status}"]
@@ -0,0 +1,185 @@
+"""
+Offline asset packer.
+Every PNG under resources/ is stored at its own size as raw BGRA pixels, the same layout convert_alpha() produces,
+so the game can map the pack into memory and copy images out of it without decoding anything.
+Nothing in it depends on the display, so one pack serves every window size and render scale.
+Run ``python -m gameplay.pack`` to rebuild it by hand; the game rebuilds it on its own when a source changes.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+MAGIC = b'FNPK'
+VERSION = 1
+ALIGN = 64
+PIXEL_FORMAT = 'BGRA'
+PACK_PATH = 'data/assets.pack'
+HEADER = struct.Struct('<4sIQI')
+DATA_START = mmap.ALLOCATIONGRANULARITY
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.normpath(path))
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def collect_images(directory: str = 'resources/') -> list[str]:
+    found = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.lower().endswith('.png'):
+                found.append(os.path.join(root, file).replace('\\', '/'))
+    return sorted(found)
+
+
+def content_hash(entries: dict) -> str:
+    """One hash over every source file's hash."""
+    digest = hashlib.sha1()
+    for path in sorted(entries):
+        digest.update(path.encode())
+        digest.update(entries[path]['hash'].encode())
+    return digest.hexdigest()
+
+
+def build_pack(out: str = PACK_PATH, directory: str = 'resources/', progress: any = None) -> dict:
+    """
+    Layout: a fixed header page, the pixel data of every image aligned to ALIGN bytes,
+    then a JSON index whose offset the header points at.
+    """
+    paths = collect_images(directory)
+    entries = {}
+    temp = out + '.tmp'
+    with open(temp, 'wb') as f:
+        f.write(bytes(DATA_START))
+        for done, path in enumerate(paths, 1):
+            image = pygame.image.load(path)
+            pixels = pygame.image.tobytes(image, PIXEL_FORMAT)
+            entries[path] = {'offset': f.tell() - DATA_START,
+                             'size': list(image.get_size()),
+                             'hash': _hash_file(path),
+                             'stat': _stat(path)}
+            f.write(pixels)
+            f.write(bytes(-len(pixels) % ALIGN))
+            if progress is not None:
+                progress(done, len(paths), path)
+
+        _write_index(f, f.tell(), {'format': PIXEL_FORMAT, 'hash': content_hash(entries), 'entries': entries})
+    os.replace(temp, out)
+    return entries
+
+
+def _write_index(f: any, index_offset: int, index: dict) -> None:
+    """Writes index at index_offset, cutting off whatever was after it, and points the header at it."""
+    data = json.dumps(index).encode()
+    f.seek(index_offset)
+    f.write(data)
+    f.truncate()
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, index_offset, len(data)))
+
+
+def _stat(path: str) -> list[int]:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class AssetPack:
+    """
+    Read side of the pack. The file is mapped read only and every surface handed out is a copy of its pixels,
+    so callers can draw onto what they get like they could onto a decoded image.
+    """
+    def __init__(self, path: str = PACK_PATH):
+        self.path = path
+        self.entries = {}
+        self.hash = None
+        self._file = None
+        self._map = None
+
+    def open(self) -> bool:
+        """Map the pack if it exists and matches the sources on disk. Returns False when it needs a rebuild."""
+        if not os.path.isfile(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            magic, version, index_offset, length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return False
+            f.seek(index_offset)
+            index = json.loads(f.read(length))
+        if index['format'] != PIXEL_FORMAT:
+            return False
+        current = self._is_current(index['entries'])
+        if current is None:
+            return False
+        if current:
+            # Touched but unchanged files get their new stat written down, so they are not hashed again next time
+            with open(self.path, 'r+b') as f:
+                _write_index(f, index_offset, index)
+
+        self.close()
+        self.hash = index['hash']
+        self.entries = {_key(path): entry for path, entry in index['entries'].items()}
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return True
+
+    @staticmethod
+    def _is_current(entries: dict) -> list[str] | None:
+        """
+        None if any source was added, removed or changed, otherwise the paths whose stat moved without their
+        contents changing. Their entries are given the new stat.
+        """
+        if set(entries) != set(collect_images()):
+            return None
+        touched = []
+        for path, entry in entries.items():
+            # Only hash the files whose size or modification time moved
+            stat = _stat(path)
+            if stat != entry['stat']:
+                if _hash_file(path) != entry['hash']:
+                    return None
+                entry['stat'] = stat
+                touched.append(path)
+        return touched
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = None
+        self._file = None
+        self.entries = {}
+
+    def __contains__(self, path: str) -> bool:
+        return _key(path) in self.entries
+
+    def surface(self, path: str) -> pygame.Surface | None:
+        entry = self.entries.get(_key(path))
+        if entry is None:
+            return None
+        width, height = entry['size']
+        start = DATA_START + entry['offset']
+        view = memoryview(self._map)[start:start + width * height * 4]
+        try:
+            # Copied out, so no surface keeps the mapping alive and close() can always unmap it
+            return pygame.image.frombuffer(view, (width, height), PIXEL_FORMAT).copy()
+        finally:
+            view.release()
+
+
+if __name__ == '__main__':
+    def report(done, total, path):
+        print(f"[{done}/{total}] {path}")
+    build_pack(progress=report if '-v' in sys.argv else None)
+    print(f"Wrote {PACK_PATH}")
@@ -1,14 +1,20 @@
 from data.game.constants import *
 from math import ceil
+from .assets import load_sound, render_text
+from .audio import HIGH, play
+from .resolution import logical, logical_font
+from .scheduler import scheduler
 
 
 class PowerManager:
+    EVENTS = (POWER_PENALTY,)
+
     def __init__(self):
-        self.font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 55)
-        self.large_font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 65)
+        self.font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 55)
+        self.large_font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 65)
         self.beep_sounds = []
         for i in range(1, 6):
-            beep = pygame.mixer.Sound(f'resources/sounds/beep_{i}.mp3')
+            beep = load_sound(f'resources/sounds/beep_{i}.mp3')
             beep.set_volume(.25)
             self.beep_sounds.append(beep)
         self.usage = Usage(self.font, self.large_font)
@@ -30,14 +36,14 @@ class PowerManager:
         self.reset_count = 0
 
         self.usage.start()
-        pygame.time.set_timer(UPDATE_POWER, 100)
-        pygame.time.set_timer(POWER_PENALTY, self.power_penalty)
+        scheduler.set_timer(UPDATE_POWER, 100)
+        scheduler.set_timer(POWER_PENALTY, self.power_penalty)
 
     def stop(self):
         self.active = False
 
-        pygame.time.set_timer(UPDATE_POWER, 0)
-        pygame.time.set_timer(POWER_PENALTY, 0)
+        scheduler.set_timer(UPDATE_POWER, 0)
+        scheduler.set_timer(POWER_PENALTY, 0)
 
     def tick(self, event: pygame.event.Event):
         if event.type == POWER_PENALTY:
@@ -49,17 +55,17 @@ class PowerManager:
             self.draw_power_percentage(surface, self.percentage)
             self.usage.draw(surface)
 
-    def draw_reset(self, surface, itter, time):
+    def update_reset(self, itter, time):
         if self.active:
             frac = itter/time
-            self.draw_power_percentage(surface, int(frac * 100))
             if int(frac * 5) > self.reset_count:
-                self.beep_sounds[self.reset_count].play()
+                play(self.beep_sounds[self.reset_count], priority=HIGH)
                 self.reset_count = int(frac * 5)
-            self.usage.draw_reset(surface, self.reset_count)
 
-    def resize(self):
-        self.usage.resize()
+    def draw_reset(self, surface, itter, time):
+        if self.active:
+            self.draw_power_percentage(surface, int(itter/time * 100))
+            self.usage.draw_reset(surface, self.reset_count)
 
     def update_power(self, usage: int):
         if self.active:
@@ -71,13 +77,13 @@ class PowerManager:
                 self.active = False
 
     def draw_power_percentage(self, surface, percentage: int):
-        lineup_offset = 5
+        lineup_offset = logical(5)
         screen_y = pygame.display.get_surface().get_height()
 
         # Get text
-        power_left_text = self.font.render(f"Power Left: ", True, 'White')
-        power_percentage = self.large_font.render(f"{percentage}", True, 'White')
-        power_percent = self.font.render(f"%", True, 'White')
+        power_left_text = render_text(self.font, "Power Left: ", True, 'White')
+        power_percentage = render_text(self.large_font, f"{percentage}", True, 'White')
+        power_percent = render_text(self.font, "%", True, 'White')
 
         # Creating rectangles
         power_left_text_rect = power_left_text.get_rect()
@@ -85,7 +91,7 @@ class PowerManager:
         power_percent_rect = power_percent.get_rect()
 
         # Setting rectangles
-        power_left_text_rect.bottomleft = (30, screen_y - 15)
+        power_left_text_rect.bottomleft = (logical(30), screen_y - logical(15))
         power_percentage_rect.bottomleft = power_left_text_rect.bottomright
         power_percent_rect.bottomleft = (power_percentage_rect.width + power_left_text_rect.bottomright[0],
                                          power_left_text_rect.bottomright[1])
@@ -97,14 +103,23 @@ class PowerManager:
 
 
 class Usage:
+    """
+    The usage meter comes from a sheet built once: a row per usage level 0-5 and
+    a row per reset stage 0-5, so drawing it is one blit of the right row.
+    """
+    GHOST_COLOR = (15, 16, 16, 150)
+    RESET_COLORS = ((217, 249, 255), (128, 204, 255))
+
     def __init__(self, font, large_font):
         self.large_font = large_font
-        self.width = 25
-        self.height = 40
-        self.y_offset = 30
-        self.padding = 3
+        self.width = round(logical(25))
+        self.height = round(logical(40))
+        self.y_offset = round(logical(30))
+        self.padding = round(logical(3))
         self.text = font.render("Usage: ", True, 'white')
         self.text_rect = self.text.get_rect()
+        self.sheet = self.build_sheet()
+        self.meter_pos = None
         self.resize()
 
         self.usage = None
@@ -114,60 +129,54 @@ class Usage:
 
     def draw(self, surface):
         surface.blit(self.text, self.text_rect)
-        self.draw_ghost(surface)
-        self.draw_color(surface)
+        self.draw_meter(surface, self.usage)
 
     def resize(self):
         screen = pygame.display.get_surface()
-        x_offset = (15 + self.height + self.padding + self.large_font.size('100')[1])
+        x_offset = (logical(15) + self.height + self.padding + self.large_font.size('100')[1])
         self.text_rect.topleft = (self.y_offset,
                                   screen.get_height() - x_offset)
-
-    def draw_ghost(self, surface):
-        for i in range(5):
-            usage_bar = pygame.Rect(self.text_rect.midright[0] + i*(self.width + self.padding),
-                                    self.text_rect.topright[1] - (self.text_rect.height - self.height)/2,
-                                    self.width,
-                                    self.height)
-            color = (15, 16, 16, 150)
-            draw = pygame.surface.Surface(usage_bar.size, pygame.SRCALPHA)
-            pygame.draw.rect(draw, color, draw.get_rect())
-            surface.blit(draw, usage_bar)
+        self.meter_pos = self.get_bar(0).topleft
+
+    def get_bar(self, i: int) -> pygame.Rect:
+        return pygame.Rect(self.text_rect.midright[0] + i*(self.width + self.padding),
+                           self.text_rect.topright[1] - (self.text_rect.height - self.height)/2,
+                           self.width,
+                           self.height)
+
+    @staticmethod
+    def get_colors(i: int) -> tuple:
+        if i <= 1:
+            return (35, 235, 31), (16, 131, 27)
+        elif i == 2:
+            return (255, 243, 0), (225, 128, 9)
+        return (255, 35, 35), (198, 0, 0)
+
+    def build_sheet(self) -> pygame.Surface:
+        step = self.width + self.padding
+        sheet = pygame.Surface((5 * step, 12 * self.height), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        for row in range(12):
+            level = row % 6
+            for i in range(5):
+                usage_bar = pygame.Rect(i * step, row * self.height, self.width, self.height)
+                sheet.fill(self.GHOST_COLOR, usage_bar)
+                if i < level:
+                    shader = pygame.Rect(0, 0, int(self.width/4), self.height)
+                    shader.midright = usage_bar.midright
+                    color, shade_color = self.get_colors(i) if row < 6 else self.RESET_COLORS
+                    pygame.draw.rect(sheet, color, usage_bar)
+                    pygame.draw.rect(sheet, shade_color, shader)
+        return sheet
+
+    def draw_meter(self, surface, level: int, reset: bool = False):
+        row = max(0, min(level, 5)) + (6 if reset else 0)
+        area = pygame.Rect(0, row * self.height, self.sheet.get_width(), self.height)
+        surface.blit(self.sheet, self.meter_pos, area)
 
     def draw_reset(self, surface, amount):
         surface.blit(self.text, self.text_rect)
-        self.draw_ghost(surface)
-        for i in range(amount):
-            usage_bar = pygame.Rect(self.text_rect.midright[0] + i*(self.width + self.padding),
-                                    self.text_rect.topright[1] - (self.text_rect.height - self.height)/2,
-                                    self.width,
-                                    self.height)
-            shader = pygame.Rect(0, 0, int(self.width/4), self.height)
-            shader.midright = usage_bar.midright
-            color = (217, 249, 255)
-            shade_color = (128, 204, 255)
-            pygame.draw.rect(surface, color, usage_bar)
-            pygame.draw.rect(surface, shade_color, shader)
-
-    def draw_color(self, surface):
-        for i in range(self.usage):
-            usage_bar = pygame.Rect(self.text_rect.midright[0] + i*(self.width + self.padding),
-                                    self.text_rect.topright[1] - (self.text_rect.height - self.height)/2,
-                                    self.width,
-                                    self.height)
-            shader = pygame.Rect(0, 0, int(self.width/4), self.height)
-            shader.midright = usage_bar.midright
-            if i <= 1:
-                color = (35, 235, 31)
-                shade_color = (16, 131, 27)
-            elif i == 2:
-                color = (255, 243, 0)
-                shade_color = (225, 128, 9)
-            else:
-                color = (255, 35, 35)
-                shade_color = (198, 0, 0)
-            pygame.draw.rect(surface, color, usage_bar)
-            pygame.draw.rect(surface, shade_color, shader)
+        self.draw_meter(surface, amount, reset=True)
 
     def __int__(self):
         return self.usage
@@ -0,0 +1,110 @@
+"""
+Dirty rectangle rendering for the office view.
+While the office sits still only the HUD pieces that changed are redrawn and pushed to the display;
+anything that moves the office (panning, a flickering door light, the cameras) falls back to a full frame.
+"""
+import pygame
+
+
+class HudSprite(pygame.sprite.DirtySprite):
+    """
+    Wraps an immediate mode draw function as a DirtySprite.
+    draw is only called again when key() returns something new; what it drew is
+    cropped to its bounding box so the sprite covers as little of the screen as possible.
+    """
+    def __init__(self, key: any, draw: any, scratch: pygame.Surface):
+        super().__init__()
+        self.key = key
+        self.draw = draw
+        self.scratch = scratch
+        self.image = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.visible = 0
+        self._last = object()
+
+    def update(self) -> None:
+        key = self.key()
+        if key == self._last:
+            return
+        self._last = key
+        self.scratch.fill((0, 0, 0, 0))
+        self.draw(self.scratch)
+        bounds = self.scratch.get_bounding_rect()
+        if bounds.width and bounds.height:
+            self.image = self.scratch.subsurface(bounds).copy()
+            self.visible = 1
+        else:
+            self.visible = 0
+        self.rect = bounds
+        self.dirty = 1
+
+
+class DirtyRenderer:
+    def __init__(self, game):
+        self.game = game
+        screen = pygame.display.get_surface()
+        scratch = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.hud = pygame.sprite.LayeredDirty(
+            HudSprite(self.clock_key, self.draw_clock, scratch),
+            HudSprite(self.mute_key, self.draw_mute, scratch),
+            HudSprite(self.power_key, self.draw_power, scratch))
+        self.background = None
+        self._signature = None
+
+    def reset(self) -> None:
+        """Forget the last frame, the next one is drawn in full."""
+        self.background = None
+        self._signature = None
+
+    def draw(self) -> list[pygame.Rect] | None:
+        """Draws a frame and returns the rects that changed, or None when the whole screen did."""
+        game = self.game
+        screen = pygame.display.get_surface()
+        game.update_scene()
+        signature = game.scene_signature()
+        still = signature is not None and signature == self._signature
+        self._signature = signature
+        if signature is None:
+            self.background = None
+            screen.fill('black')
+            game.draw(screen)
+            return None
+
+        self.hud.update()
+        if still and self.background is not None:
+            return self.hud.draw(screen)
+
+        screen.fill('black')
+        game.draw_scene(screen)
+        if still:
+            # The office stopped moving, keep what it looks like to draw the HUD over from now on
+            self.background = screen.copy()
+        self.hud.clear(screen, self.background)
+        self.hud.repaint_rect(screen.get_rect())
+        self.hud.draw(screen)
+        return None
+
+    def clock_key(self) -> tuple:
+        game = self.game
+        return not game.blacked_out, game.clock.time, game.clock.night
+
+    def draw_clock(self, surface: pygame.Surface) -> None:
+        if not self.game.blacked_out:
+            self.game.clock.draw(surface)
+
+    def mute_key(self) -> int:
+        return id(self.game.mute_button)
+
+    def draw_mute(self, surface: pygame.Surface) -> None:
+        if self.game.mute_button is not None and self.game.mute_button != 'start':
+            self.game.mute_button.draw(surface)
+
+    def power_key(self) -> tuple:
+        game = self.game
+        power = game.power_manager
+        if game.blacked_out:
+            return True, power.active, game.reset_counter, game.reset_time, power.reset_count
+        return False, power.active, power.percentage, power.usage.usage
+
+    def draw_power(self, surface: pygame.Surface) -> None:
+        self.game.draw_power(surface)
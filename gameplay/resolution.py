@@ -0,0 +1,51 @@
+"""
+The game draws into one fixed size surface and SDL scales it to the window once per frame.
+The layout is written for LOGICAL_SIZE; a render scale below 1 makes that surface smaller
+for slow machines, and logical() turns the layout's pixel values into pixels on it.
+"""
+import pygame
+from .assets import cache, sprites
+
+LOGICAL_SIZE = (1920, 1080)
+
+
+class Resolution:
+    """
+    Owns the display. The window can be any size (and resized freely) without anything being
+    scaled again, since the surface the game draws into never changes; SDL maps the mouse back onto it.
+    """
+    def __init__(self):
+        self.scale = 1
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return int(LOGICAL_SIZE[0] * self.scale), int(LOGICAL_SIZE[1] * self.scale)
+
+    def open(self, scale: float = 1, flags: int = pygame.SCALED | pygame.RESIZABLE) -> pygame.Surface:
+        self.scale = scale
+        # The animatronic sprites go straight onto the camera backgrounds, so they have to match them
+        sprites.scale = scale
+        return pygame.display.set_mode(self.size, flags)
+
+    def __call__(self, value: float) -> float:
+        return value * self.scale
+
+
+resolution = Resolution()
+
+
+def logical(value: float) -> float:
+    """A length in LOGICAL_SIZE pixels as pixels on the render target."""
+    return resolution(value)
+
+
+def logical_pos(x: float, y: float) -> tuple[int, int]:
+    return int(resolution(x)), int(resolution(y))
+
+
+def logical_rect(x: float, y: float, width: float, height: float) -> pygame.Rect:
+    return pygame.Rect(resolution(x), resolution(y), resolution(width), resolution(height))
+
+
+def logical_font(path: str, size: int) -> pygame.font.Font:
+    return cache.font(path, max(1, round(resolution(size))))
@@ -0,0 +1,157 @@
+"""
+On disk cache of scaled images.
+Backgrounds are scaled to the display once and the result is stored as raw BGRA pixels,
+keyed by the source's content hash, the target size and the filter.
+Later launches at the same resolution read the pixels back instead of scaling again,
+and editing a source only drops the entries made from it. Entries remember the display size they were made for,
+and prune() drops the ones for any other, so changing the render scale does not leave the old set behind.
+"""
+import hashlib
+import json
+import os
+
+import pygame
+from .assets import loader
+from .pack import PIXEL_FORMAT, _hash_file, _key, _stat
+
+SCALED_PATH = 'data/scaled/'
+FILTERS = {'nearest': pygame.transform.scale, 'smooth': pygame.transform.smoothscale}
+
+
+class ScaledCache:
+    def __init__(self, directory: str = SCALED_PATH):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, 'index.json'), 'r') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+            self._index.setdefault('sources', {})
+            self._index.setdefault('entries', {})
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, 'index.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.index, f)
+        os.replace(path + '.tmp', path)
+
+    def source(self, path: str) -> dict:
+        """
+        Hash and size of a source image. The pack already knows both; anything else
+        is only rehashed when its size or modification time moved.
+        """
+        sources = self.index['sources']
+        source = sources.get(_key(path))
+        pack = loader.pack
+        if pack is not None and path in pack:
+            entry = pack.entries[_key(path)]
+            current = {'stat': entry['stat'], 'hash': entry['hash'], 'size': entry['size']}
+        elif source is not None and source['stat'] == _stat(path):
+            return source
+        else:
+            current = {'stat': _stat(path), 'hash': _hash_file(path), 'size': None}
+
+        if source is None or source['hash'] != current['hash']:
+            # The source changed, whatever was scaled from the old version is useless now
+            if source is not None:
+                self._drop(source['hash'])
+            if current['size'] is None:
+                current['size'] = list(pygame.image.load(path).get_size())
+        elif current['size'] is None:
+            current['size'] = source['size']
+        if current != source:
+            sources[_key(path)] = current
+            self._save_index()
+        return current
+
+    def size_of(self, path: str) -> tuple[int, int]:
+        return tuple(self.source(path)['size'])
+
+    def image(self, path: str, factor: float, alpha: bool = True, smooth: bool = False) -> pygame.Surface:
+        """path scaled by factor the same way pygame.transform.scale_by sizes it. Every call gets its own surface."""
+        if factor == 1:
+            # loader.image() copies out of the pack or converts a decoded image, either way the surface is new
+            return loader.image(path, alpha)
+        source = self.source(path)
+        width, height = source['size']
+        size = (int(width * factor), int(height * factor))
+        name = self._name(source['hash'], size, smooth)
+        file = os.path.join(self.directory, name)
+
+        if name in self.index['entries']:
+            try:
+                pixels = bytearray(size[0] * size[1] * 4)
+                with open(file, 'rb') as f:
+                    if f.readinto(pixels) == len(pixels):
+                        self.hits += 1
+                        image = pygame.image.frombuffer(pixels, size, PIXEL_FORMAT)
+                        return image if alpha else image.convert()
+            except OSError:
+                pass
+
+        self.misses += 1
+        image = loader.image(path)
+        image = FILTERS['smooth' if smooth else 'nearest'](image, size)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(file, 'wb') as f:
+            f.write(pygame.image.tobytes(image, PIXEL_FORMAT))
+        self.index['entries'][name] = {'source': source['hash'], 'size': list(size), 'smooth': smooth,
+                                       'display': list(pygame.display.get_surface().get_size())}
+        self._save_index()
+        return image if alpha else image.convert()
+
+    @staticmethod
+    def _name(digest: str, size: tuple[int, int], smooth: bool) -> str:
+        key = f"{digest}:{size[0]}x{size[1]}:{'smooth' if smooth else 'nearest'}"
+        return hashlib.sha1(key.encode()).hexdigest() + '.raw'
+
+    def _drop(self, digest: str) -> None:
+        self._remove([name for name, entry in self.index['entries'].items() if entry['source'] == digest])
+
+    def prune(self, display: tuple[int, int]) -> int:
+        """Deletes every entry that was made for another display size. Returns how many were deleted."""
+        names = [name for name, entry in self.index['entries'].items() if entry.get('display') != list(display)]
+        if names:
+            self._remove(names)
+            self._save_index()
+        return len(names)
+
+    def _remove(self, names: list[str]) -> None:
+        for name in names:
+            del self.index['entries'][name]
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for name in self.index['entries']:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        self._index = None
+        try:
+            os.remove(os.path.join(self.directory, 'index.json'))
+        except OSError:
+            pass
+
+
+scaled = ScaledCache()
+
+
+def load_scaled(path: str, factor: float, alpha: bool = True, smooth: bool = False) -> pygame.Surface:
+    return scaled.image(path, factor, alpha, smooth)
+
+
+def image_size(path: str) -> tuple[int, int]:
+    return scaled.size_of(path)
@@ -0,0 +1,205 @@
+"""
+Game timers kept in process instead of as SDL timers.
+Everything due is kept in one heap ordered by due time (ties go in the order they were set), and nothing fires
+until update() is called, so what the clock says decides what happens, not when a background thread woke up.
+The clock is swappable: the wall clock for the real game, paused to freeze every timer exactly where it is,
+or a virtual one a test or tool moves forward as fast as it likes.
+"""
+import heapq
+import itertools
+
+import pygame
+
+
+class WallClock:
+    """Milliseconds since pygame.init(), the same clock pygame.time.set_timer runs on."""
+    def now(self) -> int:
+        return pygame.time.get_ticks()
+
+
+class PausableClock:
+    """Another clock with the time it spent paused taken out."""
+    def __init__(self, source: any = None):
+        self.source = source or WallClock()
+        self.paused_at = None
+        self.offset = 0
+
+    @property
+    def paused(self) -> bool:
+        return self.paused_at is not None
+
+    def pause(self) -> None:
+        if self.paused_at is None:
+            self.paused_at = self.source.now()
+
+    def resume(self) -> None:
+        if self.paused_at is not None:
+            self.offset += self.source.now() - self.paused_at
+            self.paused_at = None
+
+    def now(self) -> int:
+        if self.paused_at is not None:
+            return self.paused_at - self.offset
+        return self.source.now() - self.offset
+
+
+class VirtualClock:
+    """Only moves when told to."""
+    def __init__(self, time: int = 0):
+        self.time = time
+
+    def advance(self, millis: int) -> None:
+        self.time += millis
+
+    def now(self) -> int:
+        return self.time
+
+
+class Timer:
+    """One entry in the heap. action is an event to post or a function to call, loops the fires left, 0 forever."""
+    __slots__ = ('due', 'order', 'key', 'action', 'interval', 'loops', 'alive')
+
+    def __init__(self, due: int, order: int, key: any, action: any, interval: int, loops: int):
+        self.due = due
+        self.order = order
+        self.key = key
+        self.action = action
+        self.interval = interval
+        self.loops = loops
+        self.alive = True
+
+    def __lt__(self, other: 'Timer') -> bool:
+        return (self.due, self.order) < (other.due, other.order)
+
+
+class Scheduler:
+    """
+    set_timer() takes the same arguments as pygame.time.set_timer and, like it, setting a timer for an event type
+    replaces whichever one was running for it. call_later() does the same for functions, keyed by the function.
+    update() fires whatever is due: events are posted to the pygame queue, or handed to dispatch when one is given,
+    which runs them right away so a handler can set the next timer before anything later fires.
+    Repeating timers are due again interval after they were due, not after update() got to them,
+    so they never drift and a clock that jumps ahead fires every one that was missed.
+    """
+    def __init__(self, clock: any = None):
+        self.clock = clock or PausableClock()
+        self._heap = []
+        self._timers = {}
+        self._order = itertools.count()
+        self._dead = 0
+
+    def now(self) -> int:
+        return self.clock.now()
+
+    def set_timer(self, event: int | pygame.event.Event, millis: int, loops: int = 0) -> None:
+        if isinstance(event, pygame.event.Event):
+            key, action = event.type, event
+        else:
+            key, action = event, pygame.event.Event(event)
+        self._schedule(key, action, millis, loops)
+
+    def call_later(self, millis: int, callback: any, loops: int = 1) -> None:
+        self._schedule(callback, callback, millis, loops)
+
+    def _schedule(self, key: any, action: any, millis: int, loops: int) -> None:
+        self.cancel(key)
+        if millis <= 0:
+            return
+        timer = Timer(self.now() + millis, next(self._order), key, action, millis, loops)
+        self._timers[key] = timer
+        heapq.heappush(self._heap, timer)
+
+    def cancel(self, key: any) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.alive = False
+            self._dead += 1
+            # Timers that get set again every frame would otherwise pile up in the heap
+            if self._dead > 32 and self._dead > len(self._heap) // 2:
+                self._heap = [timer for timer in self._heap if timer.alive]
+                heapq.heapify(self._heap)
+                self._dead = 0
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._timers.clear()
+        self._dead = 0
+
+    def due(self, key: any) -> int | None:
+        """When the timer for key fires next, None if there is none."""
+        timer = self._timers.get(key)
+        return None if timer is None else timer.due
+
+    def next_due(self) -> int | None:
+        while self._heap and not self._heap[0].alive:
+            heapq.heappop(self._heap)
+            self._dead -= 1
+        return self._heap[0].due if self._heap else None
+
+    def pending(self) -> list[tuple[int, any]]:
+        """Every live timer as (due, key), soonest first."""
+        return sorted(((timer.due, timer.key) for timer in self._timers.values()), key=lambda item: item[0])
+
+    def update(self, dispatch: any = None) -> int:
+        """Fires everything that is due. Returns how many fired."""
+        now = self.now()
+        fired = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > now:
+                return fired
+            timer = heapq.heappop(self._heap)
+            if timer.loops != 1:
+                timer.loops = max(timer.loops - 1, 0)
+                timer.due += timer.interval
+                timer.order = next(self._order)
+                heapq.heappush(self._heap, timer)
+            else:
+                timer.alive = False
+                del self._timers[timer.key]
+            self._fire(timer.action, dispatch)
+            fired += 1
+
+    def advance(self, millis: int, dispatch: any = None) -> int:
+        """
+        Moves a VirtualClock on by millis, stopping at each timer on the way so the ones set
+        while firing count from when they fired. Returns how many fired.
+        """
+        if not isinstance(self.clock, VirtualClock):
+            raise TypeError(f"advance() needs a VirtualClock, the scheduler runs on a {type(self.clock).__name__}")
+        end = self.clock.now() + millis
+        fired = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > end:
+                break
+            self.clock.advance(due - self.clock.now())
+            fired += self.update(dispatch)
+        self.clock.advance(end - self.clock.now())
+        return fired
+
+    @staticmethod
+    def _fire(action: any, dispatch: any) -> None:
+        if not isinstance(action, pygame.event.Event):
+            action()
+        elif dispatch is not None:
+            dispatch(action)
+        else:
+            pygame.event.post(action)
+
+    @property
+    def paused(self) -> bool:
+        return getattr(self.clock, 'paused', False)
+
+    def pause(self) -> None:
+        """Freezes the clock, so nothing timed on it (timers, animations, transitions) moves until resume()."""
+        self.clock.pause()
+
+    def resume(self) -> None:
+        self.clock.resume()
+
+    def __len__(self):
+        return len(self._timers)
+
+
+scheduler = Scheduler()
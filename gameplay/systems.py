@@ -4,11 +4,20 @@ import random
 from .buttons import Button
 from data.game.constants import *
 import pygame
-from .animation import Animator
+from .animation import Animator, StaticGenerator
+from .assets import cache, load_sound, render_text
+from .atlas import TextureAtlas
+from .audio import LOW, play
+from .backend import composited, draw_rect
+from .scaled import image_size, load_scaled
+from .resolution import logical, logical_pos, logical_rect, logical_font, resolution
+from .scheduler import scheduler
 import os
 
 
 class System:
+    EVENTS = ()
+
     def __init__(self, name: str, background_path: str):
         self.name = name
         self.background_path = background_path
@@ -18,11 +27,16 @@ class System:
 class Camera:
     def __init__(self, name: str, background_path: str):
         screen = pygame.display.get_surface()
-        self.font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 70)
-        self.glitch_sound = pygame.mixer.Sound('resources/sounds/Garble1.mp3')
-        self.background = pygame.image.load(background_path).convert()
-        self.background = pygame.transform.scale_by(self.background, screen.get_height()/self.background.get_height())
-        self._background = self.background.__copy__()
+        self.font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 70)
+        self.glitch_sound = cache.sound('resources/sounds/Garble1.mp3')
+        # The clean background is never drawn onto, animatronics go on layers composited over it
+        self._background = load_scaled(background_path, screen.get_height()/image_size(background_path)[1],
+                                       alpha=False)
+        self._layers = {}
+        self._composite = None
+        self._frame = None
+        # The part of the background on screen, panning moves it across the background
+        self.view = pygame.Rect((0, 0), screen.get_size())
         self.font_pos = [0, 0]
         self.resize()
 
@@ -55,33 +69,63 @@ class Camera:
                 self.glitch_timer = 0
                 self.glitch = False
         if self.active:
-            cache = self.background.copy()
-            surface.blit(self.background, (offset, 0))
-            self.background = cache
+            self.view.x = -int(offset)
+            if composited(surface):
+                # Stacked by the renderer as they are, the composite would only be one more upload per change
+                surface.blit(self._background, (0, 0), self.view)
+                for layer in self.get_layers():
+                    surface.blit(layer, (0, 0), self.view)
+            else:
+                surface.blit(self.background, (0, 0), self.view)
             if self.glitch:
-                black = pygame.Surface(surface.get_size())
-                black.fill('black')
-                surface.blit(black, (0, 0))
+                surface.fill('black')
 
     def small_glitch(self):
-        pygame.mixer.find_channel().play(self.glitch_sound)
+        play(self.glitch_sound, priority=LOW)
         self.glitch = True
 
+    @property
+    def background(self) -> pygame.Surface:
+        """The background with every layer on it, only composited again after a layer changed."""
+        if self._frame is None:
+            if not self._layers:
+                self._frame = self._background
+            else:
+                if self._composite is None:
+                    self._composite = self._background.copy()
+                else:
+                    self._composite.blit(self._background, (0, 0))
+                for surface in self.get_layers():
+                    self._composite.blit(surface, (0, 0))
+                self._frame = self._composite
+        return self._frame
+
+    def get_layers(self) -> list[pygame.Surface]:
+        return [surface for _, surface in sorted(self._layers.values(), key=lambda layer: layer[0])]
+
+    def get_width(self) -> int:
+        return self._background.get_width()
+
+    def set_layer(self, name: str, surface: pygame.Surface | None, order: int = 0):
+        """Put surface over the background as the layer called name, drawn in order. None removes it."""
+        layer = None if surface is None else (order, surface)
+        if self._layers.get(name) == layer:
+            return
+        if layer is None:
+            del self._layers[name]
+        else:
+            self._layers[name] = layer
+        self._frame = None
+
     def reset_background(self):
-        self.background = self._background.__copy__()
+        self._layers.clear()
+        self._frame = None
 
     def resize(self):
         screen = pygame.display.get_surface()
         self.font_pos[0] = int(screen.get_width() * 6/12)
         self.font_pos[1] = int(screen.get_height() * 8/15)
 
-    @classmethod
-    def generate_cameras(cls, cameras: list[dict]) -> list:
-        final = []
-        for camera in cameras:
-            final.append(cls(camera['name'], camera['background']))
-        return final
-
     def activate(self):
         self.active = True
         self.glitch_sound.set_volume(.5)
@@ -95,51 +139,79 @@ class Camera:
 
     def draw_text(self, surface: pygame.Surface):
         if self.active:
-            text = self.font.render(self.name, True, self.font_color)
-            surface.blit(text, tuple(self.font_pos))
+            surface.blit(self.render_text(), tuple(self.font_pos))
+
+    def render_text(self) -> pygame.Surface:
+        return render_text(self.font, self.name, True, self.font_color)
 
 
 class Cameras(System):
-    def __init__(self):
+    EVENTS = (CAMERA_FLIPPED_UP, CAMERA_FLIPPED_DOWN, CAMERA_ROTATION) + Button.EVENTS
+
+    def __init__(self, lazy: bool = False):
         super().__init__("Cams System", 'resources/background/test.png')
+        self.camera_pan_sound = None
+        self.font = None
+        self.camera_switch_sound = None
+        self.animation = None
+        self.camera_list = None
+        self.map_image = None
+        self.static = None
+        self.switches = None
+        self.icons = None
+        self.active_icons = None
+        self.inactive_icons = None
+        self.record_icon = None
+
+        # The camera name, map and buttons only change on a switch or resize, so they are drawn once into here
+        self.hud = None
+        self.hud_rect = None
+        self.hud_dirty = True
+
+        # Declare Variables
+        self.SWITCH_TIME = None
+        self.MAX_ROTATION = None
+        self.enabled = None
+        self.active = None
+        self._last_camera = None
+        self.current_rotation = None
+        self.rotation_cycle = None
+        self.switching = None
+        self.switch_count = None
+        if not lazy:
+            for _ in self.load():
+                pass
 
+    def load(self):
+        """Loads the resources one image at a time, yielding after each so Game can spread them over frames."""
         # Load Resources
-        self.camera_pan_sound = pygame.mixer.Sound('resources/sounds/camera_pan.mp3')
-        self.font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 90)
-        self.camera_switch_sound = pygame.mixer.Sound('resources/sounds/static.mp3')
+        self.camera_pan_sound = load_sound('resources/sounds/camera_pan.mp3')
+        self.font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 90)
+        self.camera_switch_sound = load_sound('resources/sounds/static.mp3')
         self.camera_switch_sound.set_volume(1)
-        self.animation = Animator(pygame.image.load('resources/animations/Camera_Flip.png').convert_alpha(),
-                                  pygame.rect.Rect(0, 0, 1920, 1080),
+        self.animation = Animator(load_scaled('resources/animations/Camera_Flip.png', resolution.scale),
+                                  pygame.rect.Rect((0, 0), resolution.size),
                                   speed=.5)
-        self.camera_list = Camera.generate_cameras(self.load_data('cameras'))
+        yield
+        self.camera_list = []
+        for camera in self.load_data('cameras'):
+            self.camera_list.append(Camera(camera['name'], camera['background']))
+            yield
         self.map_image = self.init_images()
-        self.static = []
-        for frame in os.listdir('resources/animations/static/'):
-            image = pygame.image.load(f'resources/animations/static/{frame}').convert_alpha()
-            image.set_alpha(100)
-            self.static.append(image)
+        self.static = StaticGenerator.shared()
         self.switches = []
         for frame in os.listdir('resources/animations/switch/'):
-            image = pygame.image.load(f"resources/animations/switch/{frame}").convert_alpha()
+            image = load_scaled(f"resources/animations/switch/{frame}", resolution.scale)
             self.switches.append(image)
+            yield
+        self.icons = TextureAtlas.from_directory('resources/ui/buttons/camera_icons', self.icon_scale())
         self.active_icons, self.inactive_icons = self.load_camera_buttons(self.load_data('cameras'))
 
         # Init Subsets
         self.generate_buttons()
-        self.record_icon = RecordIcon((30, 30), 10, 3)
+        self.record_icon = RecordIcon(logical_pos(30, 30), 10, 3)
         self.camera_switch_sound.set_volume(.25)
 
-        # Declare Variables
-        self.SWITCH_TIME = None
-        self.MAX_ROTATION = None
-        self.enabled = None
-        self.active = None
-        self._last_camera = None
-        self.current_rotation = None
-        self.rotation_cycle = None
-        self.switching = None
-        self.switch_count = None
-
     def start(self):
         self.SWITCH_TIME = 4
         self.MAX_ROTATION = 90
@@ -155,13 +227,13 @@ class Cameras(System):
         self.disable_cameras()
         for camera in self.camera_list:
             camera.start()
-        pygame.time.set_timer(pygame.event.Event(CAMERA_ROTATION), 3300)
+        scheduler.set_timer(pygame.event.Event(CAMERA_ROTATION), 3300)
 
     def stop(self):
         self.active = False
         for camera in self.camera_list:
             camera.stop()
-        pygame.time.set_timer(CAMERA_ROTATION, 0)
+        scheduler.set_timer(CAMERA_ROTATION, 0)
 
     def tick(self, event: pygame.event.Event):
         for button in self.buttons:
@@ -174,6 +246,10 @@ class Cameras(System):
             self.calculate_rotation()
 
     def draw(self):
+        self.update()
+        self.render(pygame.display.get_surface())
+
+    def update(self):
         if self.active:
             self.camera_pan_sound.set_volume(.2)
         else:
@@ -185,25 +261,57 @@ class Cameras(System):
             self.current_rotation -= 1
         self.current_rotation = max(-self.MAX_ROTATION, min(self.current_rotation, self.MAX_ROTATION))
 
-        screen = pygame.display.get_surface()
+    def render(self, screen: pygame.Surface):
         if self.active and not self.animation.active:
             for i, camera in enumerate(self.camera_list):
-                offset = self.get_pos_from_rot(screen.get_width(), camera.background.get_width())
+                offset = self.get_pos_from_rot(screen.get_width(), camera.get_width())
                 camera.draw(screen, offset)
-            self.draw_static(screen, self.static)
+            self.static.draw(screen, 100)
             if self.switching:
                 self.draw_switch(screen)
-            for i in self.camera_list:
-                i.draw_text(screen)
-            self.draw_map(screen)
-            for button in self.buttons:
-                button.draw(screen)
+            self.draw_hud(screen)
 
-            pygame.draw.rect(screen, (170, 170, 170), pygame.rect.Rect(10, 10, 1900, 1060), 2, 1)
+            draw_rect(screen, (170, 170, 170), logical_rect(10, 10, 1900, 1060), max(1, round(logical(2))), 1)
             self.record_icon.draw(screen)
 
         self.animation.draw(screen)
 
+    def draw_hud(self, screen: pygame.Surface):
+        if composited(screen):
+            # Plain alpha blits one by one are what the premultiplied HUD is built to match
+            for surface, pos in self.hud_pieces(screen):
+                screen.blit(surface, pos)
+            return
+        if self.hud is None or self.hud.get_size() != screen.get_size():
+            self.hud = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.hud_dirty = True
+        if self.hud_dirty:
+            self.build_hud()
+        screen.blit(self.hud, self.hud_rect, self.hud_rect, pygame.BLEND_PREMULTIPLIED)
+
+    def build_hud(self):
+        """
+        Stacks the camera name, the see-through map and the buttons into the HUD surface.
+        Stacking translucent images with plain alpha blits would not match blitting them
+        one by one onto the screen, so everything goes on premultiplied.
+        """
+        self.hud.fill((0, 0, 0, 0))
+        rects = []
+
+        for surface, pos in self.hud_pieces(self.hud):
+            # premul_alpha() reads padded rows (rendered text, atlas subsurfaces) wrong, so pack them first
+            premultiplied = surface.convert_alpha().premul_alpha()
+            rects.append(self.hud.blit(premultiplied, pos, special_flags=pygame.BLEND_PREMULTIPLIED))
+        self.hud_rect = rects[0].unionall(rects[1:])
+        self.hud_dirty = False
+
+    def hud_pieces(self, surface: pygame.Surface) -> list[tuple[pygame.Surface, any]]:
+        """Everything on the HUD with where it goes on surface, bottom first."""
+        pieces = [(camera.render_text(), camera.font_pos) for camera in self.camera_list if camera.active]
+        pieces.append((self.map_image, self.map_rect(surface)))
+        pieces.extend((button.surface, button.rect) for button in self.buttons if button.surface)
+        return pieces
+
     def draw_switch(self, screen):
         screen.blit(self.switches[random.randint(0, len(self.switches) - 1)], (0, 0))
         self.switch_count += 1
@@ -235,6 +343,7 @@ class Cameras(System):
             pygame.event.post(pygame.event.Event(CAMERA_FLIPPED_DOWN))
 
     def disable_cameras(self):
+        self.hud_dirty = True
         for i, camera in enumerate(self.camera_list):
             self.buttons[i].change_surface(self.inactive_icons[i])
             camera.deactivate()
@@ -246,7 +355,7 @@ class Cameras(System):
 
     def activate_camera(self, camera_index: int):
         if self.active:
-            self.camera_switch_sound.play(fade_ms=100)
+            play(self.camera_switch_sound, fade_ms=100)
             self.camera_switch_sound.fadeout(200)
             self.switching = True
         self.disable_cameras()
@@ -262,27 +371,28 @@ class Cameras(System):
         match self.rotation_cycle:
             case 0:
                 self.current_rotation = -90
-                self.camera_pan_sound.play(maxtime=3600)
+                play(self.camera_pan_sound, priority=LOW, maxtime=3600)
             case 1:
                 self.camera_pan_sound.set_volume(0)
                 self.current_rotation = 90
             case 2:
                 self.current_rotation = 90
-                self.camera_pan_sound.play(maxtime=3600)
+                play(self.camera_pan_sound, priority=LOW, maxtime=3600)
             case 3:
                 self.camera_pan_sound.set_volume(0)
                 self.current_rotation = -90
 
-    def draw_map(self, surface: pygame.surface.Surface):
+    def map_rect(self, surface: pygame.surface.Surface) -> pygame.Rect:
         rect = self.map_image.get_rect()
-        rect.bottomright = (surface.get_width() - 20, surface.get_height() - 25)
-        font = pygame.font.Font('resources/fonts/five-nights-at-freddys.ttf', 100)
-        self.map_image.blit(font.render("YOU", True, "white"), (640, 530))
-        surface.blit(self.map_image, rect)
+        rect.bottomright = (surface.get_width() - logical(20), surface.get_height() - logical(25))
+        return rect
 
     def resize(self):
+        self.hud_dirty = True
         self.map_image = self.init_images()
         camera_data = self.load_data('cameras')
+        self.icons.rescale(self.icon_scale())
+        self.active_icons, self.inactive_icons = self.load_camera_buttons(camera_data)
         for i in range(len(self.camera_list)):
             self.camera_list[i].resize()
             x, y = tuple(camera_data[i]["position"])
@@ -292,7 +402,9 @@ class Cameras(System):
             rect_x, rect_y = rect.topleft
             pos_x = rect_x + (rect.width * (x / regular_size[0]))
             pos_y = rect_y + (rect.height * (y / regular_size[1]))
-            self.buttons[i].resize((pos_x, pos_y), pygame.display.get_surface().get_width() / 4500)
+            icons = self.active_icons if self.camera_list[i].active else self.inactive_icons
+            self.buttons[i].change_surface(icons[i])
+            self.buttons[i].resize((pos_x, pos_y))
 
     def generate_buttons(self):
         for i in range(len(self.camera_list)):
@@ -305,26 +417,26 @@ class Cameras(System):
     @staticmethod
     def init_images():
         screen = pygame.display.get_surface()
-        map_image = pygame.image.load('resources/ui/map.png').convert_alpha()
-        scale_factor = Cameras.get_scaler(screen, map_image)
-        map_image = pygame.transform.scale_by(map_image, scale_factor)
-        map_image.set_alpha(200)
+        path = 'resources/ui/map.png'
+        map_image = load_scaled(path, screen.get_width()/(2.1*image_size(path)[0]))
+        font = logical_font('resources/fonts/five-nights-at-freddys.ttf', 100)
+        map_image.blit(render_text(font, "YOU", True, "white"), logical_pos(640, 530))
+        cache.release(font)
+        # See-through, baked into the pixels rather than set_alpha(200) so the HUD can premultiply it
+        map_image.fill((255, 255, 255, 200), special_flags=pygame.BLEND_RGBA_MULT)
         return map_image
 
     @staticmethod
-    def load_camera_buttons(data: list[dict]):
-        active_path = "resources/ui/buttons/camera_icons/active"
-        inactive_path = "resources/ui/buttons/camera_icons/inactive"
-        scale_factor = 2
+    def icon_scale() -> float:
+        # The icons are drawn at twice their size, scaled down with the screen width
+        return 2 * pygame.display.get_surface().get_width() / 4500
+
+    def load_camera_buttons(self, data: list[dict]):
         active_icons = []
         inactive_icons = []
         for camera in data:
-            active = pygame.image.load(active_path + "/" + camera['label'] + ".png").convert_alpha()
-            inactive = pygame.image.load(inactive_path + "/" + camera['label'] + ".png").convert_alpha()
-            active = pygame.transform.scale_by(active, scale_factor)
-            inactive = pygame.transform.scale_by(inactive, scale_factor)
-            active_icons.append(active)
-            inactive_icons.append(inactive)
+            active_icons.append(self.icons.get("active/" + camera['label']))
+            inactive_icons.append(self.icons.get("inactive/" + camera['label']))
         return active_icons, inactive_icons
 
     @staticmethod
@@ -337,12 +449,6 @@ class Cameras(System):
     def get_scaler(surface: pygame.Surface, rect: pygame.Surface | pygame.Rect):
         return surface.get_width()/(2.1*rect.get_width())
 
-    @staticmethod
-    def draw_static(screen: pygame.surface.Surface, static):
-        frame = random.randint(0, len(static) - 1)
-        image = static[frame]
-        screen.blit(image, (0, 0))
-
 
 class RecordIcon:
     def __init__(self, pos: tuple[int, int], radius: int, flash_time: float):
@@ -356,7 +462,7 @@ class RecordIcon:
         size = self.radius * 2
         surface = pygame.Surface((size, size), pygame.SRCALPHA)
         pygame.draw.circle(surface, "red", (size // 2, size // 2), self.radius)
-        surface = pygame.transform.scale_by(surface, 30/self.radius)
+        surface = pygame.transform.scale_by(surface, logical(30)/self.radius)
         return surface
 
     def draw(self, screen):
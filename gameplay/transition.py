@@ -0,0 +1,138 @@
+"""
+Screen transitions that run inside the main loop instead of blocking it.
+How far along a transition is comes from the scheduler's milliseconds since it began, not from how many frames were drawn,
+and every transition draws through the one overlay surface Transitions keeps.
+"""
+import pygame
+from .backend import changed
+from .scheduler import scheduler
+
+
+class Transition:
+    """
+    A transition over duration milliseconds. prepare() fills the overlay once when it begins
+    and draw() puts it on the screen with how far along it is, from 0 to 1.
+    on_done is called once after the last frame.
+    """
+    def __init__(self, duration: int, on_done: any = None):
+        self.duration = max(duration, 1)
+        self.on_done = on_done
+        self.start_time = None
+
+    def begin(self, overlay: pygame.Surface, screen: pygame.Surface) -> None:
+        self.start_time = scheduler.now()
+        self.prepare(overlay, screen)
+
+    def progress(self) -> float:
+        return min((scheduler.now() - self.start_time) / self.duration, 1)
+
+    def prepare(self, overlay: pygame.Surface, screen: pygame.Surface) -> None:
+        pass
+
+    def draw(self, screen: pygame.Surface, overlay: pygame.Surface, progress: float) -> None:
+        pass
+
+
+class FadeOut(Transition):
+    """Fades whatever is drawn underneath to black."""
+    def prepare(self, overlay, screen):
+        overlay.fill('black')
+
+    def draw(self, screen, overlay, progress):
+        overlay.set_alpha(int(255 * progress))
+        screen.blit(overlay, (0, 0))
+
+
+class FadeIn(FadeOut):
+    """Fades in from black to whatever is drawn underneath."""
+    def draw(self, screen, overlay, progress):
+        super().draw(screen, overlay, 1 - progress)
+
+
+class Tint(Transition):
+    """
+    Draws image, washes it over in color (multiplied in like BLEND_RGB_MULT) and fades the result to black.
+    The tinted copy is made once, into the overlay.
+    """
+    def __init__(self, image: pygame.Surface, duration: int, color: tuple = (207, 0, 7), on_done: any = None):
+        super().__init__(duration, on_done)
+        self.image = image
+        self.color = color
+
+    def prepare(self, overlay, screen):
+        overlay.fill('black')
+        overlay.blit(self.image, (0, 0))
+        overlay.fill(self.color, special_flags=pygame.BLEND_RGB_MULT)
+
+    def draw(self, screen, overlay, progress):
+        alpha = int(255 * progress)
+        screen.fill('black')
+        screen.blit(self.image, (0, 0))
+        overlay.set_alpha(alpha)
+        screen.blit(overlay, (0, 0))
+        # Multiplying by the inverse is the same as laying black over it at alpha, without a second surface
+        screen.fill((255 - alpha,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+
+
+class Crossfade(Transition):
+    """Fades from what was on the screen when it began to whatever is drawn underneath now."""
+    def prepare(self, overlay, screen):
+        overlay.blit(screen, (0, 0))
+
+    def draw(self, screen, overlay, progress):
+        overlay.set_alpha(int(255 * (1 - progress)))
+        screen.blit(overlay, (0, 0))
+
+
+class Transitions:
+    """
+    Runs one transition at a time. The main loop draws the scene as usual, then draw() lays the transition over it.
+    The overlay is only made again when the screen changes size.
+    """
+    def __init__(self):
+        self.overlay = None
+        self.active = None
+
+    @property
+    def running(self) -> bool:
+        return self.active is not None
+
+    def play(self, transition: Transition, source: pygame.Surface = None) -> Transition:
+        """source is what is on the screen now, the display surface unless the frame was drawn somewhere else."""
+        screen = pygame.display.get_surface()
+        if self.overlay is None or self.overlay.get_size() != screen.get_size():
+            self.overlay = pygame.Surface(screen.get_size()).convert()
+        self.overlay.set_alpha(None)
+        transition.begin(self.overlay, screen if source is None else source)
+        changed(self.overlay)
+        self.active = transition
+        return transition
+
+    def fade_out(self, duration: int, on_done: any = None) -> Transition:
+        return self.play(FadeOut(duration, on_done))
+
+    def fade_in(self, duration: int, on_done: any = None) -> Transition:
+        return self.play(FadeIn(duration, on_done))
+
+    def tint(self, image: pygame.Surface, duration: int, color: tuple = (207, 0, 7),
+             on_done: any = None) -> Transition:
+        return self.play(Tint(image, duration, color, on_done))
+
+    def crossfade(self, duration: int, on_done: any = None, source: pygame.Surface = None) -> Transition:
+        """Starts from what is on the screen right now, so call it before anything new is drawn."""
+        return self.play(Crossfade(duration, on_done), source)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        transition = self.active
+        if transition is None:
+            return
+        progress = transition.progress()
+        transition.draw(screen, self.overlay, progress)
+        if progress >= 1:
+            # Cleared first so on_done can start the next transition
+            self.active = None
+            if transition.on_done is not None:
+                transition.on_done()
+
+
+transitions = Transitions()
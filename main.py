@@ -1,108 +1,233 @@
 # import gc
-import pygame.display
-import pygame_widgets
-from gameplay import *
+import sys
+from profiler import trace
+if '--startup-trace' in sys.argv:
+    trace.enable()
+with trace.phase('import pygame'):
+    import pygame.display
+    import pygame_widgets
+with trace.phase('import gameplay'):
+    from gameplay import *
+    import data.game.constants
 # from data.saves.save import SaveManager
 # import time
 
+# What is ignored while a transition runs, everything else (timers, menu changes, window events) still goes through
+INPUT_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.KEYDOWN, pygame.KEYUP)
+# The game's own events by the names data/game/constants.py gives them, for --event-counts
+EVENT_NAMES = {value: name for name, value in vars(data.game.constants).items() if name.isupper()}
 
-def fade_image(image: pygame.surface.Surface, screen: pygame.surface.Surface, len_dir: range, color=False):
-    for i in len_dir:
-        img = image.copy()
-        black = pygame.surface.Surface((1920, 1080))
-        black.fill((0, 0, 0))
-        black.set_alpha(i)
-        screen.blit(img, (0, 0))
-        if color:
-            img.fill((207, 0, 7), special_flags=pygame.BLEND_RGB_MULT)
-            img.set_alpha(i)
-            screen.blit(img, (0, 0))
-        screen.blit(black, (0, 0))
-        pygame.display.flip()
+
+def draw_progress(image: pygame.surface.Surface, screen: pygame.surface.Surface, done: int, total: int):
+    pygame.event.pump()
+    fraction = done / max(total, 1)
+    image.set_alpha(int(255 * fraction))
+    screen.fill('black')
+    screen.blit(image, (0, 0))
+    bar = pygame.Rect(0, 0, int(screen.get_width() * fraction), logical(6))
+    bar.bottomleft = (0, screen.get_height())
+    pygame.draw.rect(screen, (201, 0, 7), bar)
+    pygame.display.flip()
+
+
+def warm_up(steps: any, budget: int = 8):
+    """
+    Spend what is left of this frame on the next steps of building things in the background of the menu.
+    The budget is only checked between steps, so no step should take much longer than a frame.
+    """
+    start = pygame.time.get_ticks()
+    for _ in steps:
+        if pygame.time.get_ticks() - start >= budget:
+            return
+
+
+def set_paused(paused: bool):
+    """Stops the night where it is: its timers, animations, transitions and sounds."""
+    if paused:
+        scheduler.pause()
+        pygame.mixer.pause()
+        pygame.mixer.music.pause()
+    else:
+        scheduler.resume()
+        pygame.mixer.unpause()
+        pygame.mixer.music.unpause()
+
+
+def event_counts(bus: EventBus) -> str:
+    """What the bus dispatched since it was last cleared, with pygame's names for the events that are not the game's."""
+    names = {event_type: pygame.event.event_name(event_type) for event_type in bus.counts}
+    return bus.report({**names, **EVENT_NAMES})
+
+
+def warmed_up():
+    loader.release()
+    cache.evict()
+    if '--asset-timings' in sys.argv:
+        print(loader.report())
+    if trace.enabled:
+        trace.write()
 
 
 def main():
-    pygame.init()
-    pygame.mixer.pre_init(44100, -16, 2, 512)
-    pygame.mixer.set_num_channels(64)
-    pygame.display.set_mode((1920, 1080))
+    with trace.phase('pygame.init'):
+        pygame.init()
+        pygame.mixer.pre_init(44100, -16, 2, 512)
+        pygame.mixer.set_num_channels(64)
+    render_scale = 1
+    for arg in sys.argv:
+        if arg.startswith('--render-scale='):
+            render_scale = min(max(float(arg.split('=')[1]), .25), 1)
+    with trace.phase('display.set_mode'):
+        resolution.open(render_scale)
+    scaled.prune(resolution.size)
     pygame.display.set_caption('Five Nights At Lone Peak High')
     pygame.display.set_icon(pygame.image.load('resources/ui/icon.png').convert())
     loading_image = pygame.image.load('resources/ui/menus/main_menu/LogoLoadingScreen.png').convert_alpha()
-    background_sound = pygame.mixer.Sound('resources/sounds/main_menu.mp3')
-    fade_image(loading_image, pygame.display.get_surface(), range(255, 0, -1))
-    pygame.display.get_surface().blit(loading_image, (0, 0))
-    pygame.display.flip()
+    if loading_image.get_size() != resolution.size:
+        loading_image = pygame.transform.smoothscale(loading_image, resolution.size)
+    steps = 100
+
+    def progress(done, total, path):
+        if done == total or done * steps // total != (done - 1) * steps // total:
+            draw_progress(loading_image, pygame.display.get_surface(), done, total)
+    with trace.phase('asset pack'):
+        pack = AssetPack()
+        if not pack.open():
+            build_pack(progress=progress)
+            pack.open()
+    loader.pack = pack
+    for arg in sys.argv:
+        if arg.startswith('--sprite-budget='):
+            sprites.set_budget(int(arg.split('=')[1]) * 1024 * 1024)
+    with trace.phase('preload'):
+        loader.preload(collect_assets(), wait=False)
+    loading_image.set_alpha(None)
+    background_sound = MusicStream('resources/sounds/main_menu.mp3')
     clock = pygame.time.Clock()
-    menus = [MainMenu(), Options(0), Cheat(1), Credits(1)]
-    game = Game()
+    # Only the main menu is needed right away, the rest is built the first time it is navigated to
+    factories = [MainMenu, lambda: Options(0), lambda: Cheat(1), lambda: Credits(1)]
+    names = ['MainMenu', 'Options', 'Cheat', 'Credits']
+    menus = [None] * len(factories)
+
+    def get_menu(index: int):
+        if menus[index] is None:
+            with trace.phase(f'menus/{names[index]}'):
+                menus[index] = factories[index]()
+        return menus[index]
+    # The game can composite on the GPU instead, menus always draw on the display surface
+    backend = texture_backend() if '--gpu' in sys.argv else None
+    game = Game(lazy=True, dirty_rects='--dirty-rects' in sys.argv, backend=backend, trace=trace)
     save_manager = SaveManager()
-    active_menu = menus[0]
+    active_menu = get_menu(0)
     active_menu.start()
     playing = False
-    fade_image(loading_image, pygame.display.get_surface(), range(255), True)
-    save_manager.load_data()
-    background_sound.play(loops=-1)
-    for i in range(64):
-        pygame.mixer.Channel(i).set_volume(save_manager.data['volume']/100)
+    with trace.phase('save load'):
+        save_manager.load_data()
+    set_volume(save_manager.data['volume'])
+
+    def menu_ready():
+        background_sound.play(loops=-1)
+        trace.mark('main menu interactive')
+
+    def warming():
+        """The game a step at a time, then the menus nobody went to yet, then what was preloaded is let go."""
+        while not game.warm_up():
+            yield
+        for index in range(len(menus)):
+            get_menu(index)
+            yield
+        warmed_up()
+    warm_up_steps = warming()
+
+    def start_playing():
+        nonlocal playing
+        playing = True
+        # The screen is black by now, whatever is left can be finished at once
+        for _ in warm_up_steps:
+            pass
+        game.start()
+
+    def shown_frame() -> pygame.Surface:
+        """What is on the screen. A texture backend's frame is gone once presented, so the game draws it again."""
+        if playing and backend is not None:
+            backend.clear()
+            game.draw(backend)
+            return backend.snapshot()
+        return pygame.display.get_surface()
+    transitions.tint(loading_image, 1500, on_done=menu_ready)
 
     # Window Loop
     while True:
-        pygame.display.get_surface().fill("black")
+        # Game timers post their events here, so they are handled this frame like any other
+        scheduler.update()
+        mixer.update()
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
+            if event.type == pygame.WINDOWFOCUSLOST and playing:
+                # Nobody can watch the doors from another window
+                set_paused(True)
+            elif event.type == pygame.WINDOWFOCUSGAINED and scheduler.paused:
+                set_paused(False)
+            if transitions.running and event.type in INPUT_EVENTS:
+                # Nothing reacts to input until the screen is done changing
+                continue
             if event.type == MENU_CHANGE:
                 if event.func == 'menu':
+                    if playing and '--event-counts' in sys.argv:
+                        print(event_counts(game.bus))
+                        game.bus.counts.clear()
+                    transitions.crossfade(500, source=shown_frame())
                     save_manager.load_data()
+                    set_volume(save_manager.data['volume'])
                     background_sound.play(loops=-1)
-                    for i in range(64):
-                        pygame.mixer.Channel(i).set_volume(save_manager.data['volume']/100)
                     playing = False
-                    active_menu = menus[0]
+                    active_menu = get_menu(0)
                     active_menu.start()
                 elif event.func == 'next':
-                    menus[0].continue_game()
+                    get_menu(0).continue_game()
                 elif event.func == 'change':
                     active_menu.stop()
-                    active_menu = menus[event.target]
+                    active_menu = get_menu(event.target)
                     active_menu.start()
                 elif event.func == 'continue_game':
-                    for i in range(0, 255):
-                        black = pygame.surface.Surface((1920, 1080))
-                        black.set_alpha(i)
-                        pygame.display.get_surface().blit(black, (0, 0))
-                        pygame.display.flip()
-                        clock.tick(60)
-                    playing = True
-                    game.start()
+                    transitions.fade_out(1000, on_done=start_playing)
                 elif event.func == 'start_game':
                     background_sound.fadeout(4000)
-                    for i in range(0, 255):
-                        black = pygame.surface.Surface((1920, 1080))
-                        black.set_alpha(i)
-                        menus[0].draw(pygame.display.get_surface())
-                        pygame.display.get_surface().blit(black, (0, 0))
-                        pygame.display.flip()
-                        clock.tick(60)
-                    playing = True
-                    game.start()
+                    transitions.fade_out(4250, on_done=start_playing)
                 elif event.func == 'go_background':
-                    menus[0].cheat_background()
+                    get_menu(0).cheat_background()
                 elif event.func == 'end_background':
-                    menus[0].end_cheat_background()
+                    get_menu(0).end_cheat_background()
             if playing:
                 game.global_tick(event)
             else:
                 active_menu.tick(event)
+        screen = pygame.display.get_surface()
+        target = backend if playing and backend is not None else screen
+        if target is screen and (not (playing and game.dirty_rects) or transitions.running):
+            screen.fill("black")
+        rects = None
         if playing:
-            game.global_draw()
+            rects = game.render()
         else:
-            active_menu.draw(pygame.display.get_surface())
+            active_menu.draw(screen)
+        if transitions.running:
+            events = [event for event in events if event.type not in INPUT_EVENTS]
         pygame_widgets.update(events)
-        pygame.display.update()
+        if transitions.running:
+            transitions.draw(target)
+            rects = None
+        if target is not screen:
+            target.present()
+        elif rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+        if not playing:
+            warm_up(warm_up_steps)
         clock.tick(60)
 
 
@@ -0,0 +1,152 @@
+"""
+Startup trace: wall time and resident memory change for each loading phase.
+Lives outside gameplay/ so it can be imported before pygame is.
+"""
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+
+def resident_memory() -> int:
+    """Resident set size of this process in bytes, 0 if the platform doesn't tell us."""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return 0
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+class Phase:
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0
+        self.memory = 0
+        self.children = []
+
+    def to_dict(self) -> dict:
+        return {'name': self.name,
+                'seconds': round(self.seconds, 4),
+                'memory_kb': self.memory // 1024,
+                'children': [child.to_dict() for child in self.children]}
+
+
+class StartupTrace:
+    """
+    Records nested phases. Does nothing until enable() is called, so the phase()
+    calls can stay in the constructors for good.
+    A name like 'Game/Cameras' files the phase under a top level 'Game' node no matter
+    what else is running, for work that is spread across frames. Each time the same name
+    comes up again its time is added to the node that is already there.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.root = Phase('startup')
+        self._stack = [self.root]
+        self._start = None
+        self._start_memory = None
+
+    def enable(self) -> None:
+        self.enabled = True
+        self._start = time.perf_counter()
+        self._start_memory = resident_memory()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str):
+        *path, name = name.split('/')
+        ancestors = self._path(path)
+        if ancestors:
+            # Work spread across frames comes back under the same name, and adds up in one node
+            node = self._path(path + [name])[-1]
+        else:
+            node = Phase(name)
+            self._stack[-1].children.append(node)
+        self._stack.append(node)
+        memory = resident_memory()
+        start = time.perf_counter()
+        try:
+            yield node
+        finally:
+            seconds = time.perf_counter() - start
+            memory = resident_memory() - memory
+            for phase in ancestors + [node]:
+                phase.seconds += seconds
+                phase.memory += memory
+            self._stack.pop()
+
+    def _path(self, names: list[str]) -> list[Phase]:
+        nodes = []
+        parent = self.root
+        for name in names:
+            node = next((child for child in parent.children if child.name == name), None)
+            if node is None:
+                node = Phase(name)
+                parent.children.append(node)
+            nodes.append(node)
+            parent = node
+        return nodes
+
+    def mark(self, name: str) -> None:
+        """A zero length entry holding the time since startup began, for milestones."""
+        if self.enabled:
+            node = Phase(name)
+            node.seconds = time.perf_counter() - self._start
+            node.memory = resident_memory() - self._start_memory
+            self.root.children.append(node)
+
+    def finish(self) -> None:
+        self.root.seconds = time.perf_counter() - self._start
+        self.root.memory = resident_memory() - self._start_memory
+
+    def to_dict(self) -> dict:
+        import pygame
+        return {'python': platform.python_version(),
+                'pygame': pygame.version.ver,
+                'platform': platform.platform(),
+                'phases': self.root.to_dict()}
+
+    def to_text(self) -> str:
+        lines = []
+
+        def walk(node, prefix, last, depth):
+            branch = '' if depth == 0 else prefix + ('└─ ' if last else '├─ ')
+            label = branch + node.name
+            lines.append(f"{label:<48} {node.seconds:8.3f} s {node.memory / 2 ** 20:+9.1f} MB")
+            child_prefix = '' if depth == 0 else prefix + ('   ' if last else '│  ')
+            for i, child in enumerate(node.children):
+                walk(child, child_prefix, i == len(node.children) - 1, depth + 1)
+        walk(self.root, '', True, 0)
+        return '\n'.join(lines)
+
+    def write(self, path: str = 'startup_trace') -> None:
+        self.finish()
+        with open(path + '.json', 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(self.to_text() + '\n')
+
+
+trace = StartupTrace()
@@ -0,0 +1,301 @@
+"""
+Headless night simulator for balancing data/game/nights.json.
+Runs the real game logic with SDL's dummy video and audio drivers, on the scheduler's virtual clock,
+while a player policy works the doors, lights and cameras. Nights are spread over a process pool
+(each worker builds the game once) and the results are summed up per night.
+
+    python simulate.py --nights=1,2,3 --runs=1000 --policy=cautious --workers=8
+    python simulate.py --nights-file=my_nights.json --json=results.json
+
+Other options: --seed=N (runs are seeded seed, seed + 1, ...) and --step=MS, how often the player gets to act.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from data.saves.save import SaveManager
+from data.game.constants import *
+from data.game.timing import HOURS, HOUR_NAMES, clock_time
+
+
+class MemorySave(SaveManager):
+    """Plays whichever night it is told to and never writes the player's save."""
+    def __init__(self):
+        super().__init__()
+        self.data = {'night': 1, 'stars': 0, 'volume': 0}
+
+    def load_data(self) -> dict:
+        return self.data
+
+    @staticmethod
+    def save_data(data: dict) -> None:
+        pass
+
+
+class Policy:
+    """
+    What the player does. act() runs every step with the milliseconds since the night began.
+    The base policy does nothing at all, the helpers only do what the player could do with the mouse.
+    """
+    def __init__(self, game, dispatch: any, rng: random.Random):
+        self.game = game
+        self.dispatch = dispatch
+        self.rng = rng
+        self.cameras = game.systems['Cameras']
+
+    def act(self, now: int) -> None:
+        pass
+
+    @property
+    def in_office(self) -> bool:
+        return self.game.office.active and not self.game.blacked_out
+
+    def watch(self, camera: int) -> None:
+        if self.game.office.active:
+            self.dispatch(pygame.event.Event(CAMERA_FLIPPED_UP))
+        self.cameras.activate_camera(camera)
+
+    def look_away(self) -> None:
+        if not self.game.office.active:
+            self.dispatch(pygame.event.Event(CAMERA_FLIPPED_DOWN))
+
+    def set_door(self, door, closed: bool) -> None:
+        if self.in_office and (door.door_status == 'closed') != closed:
+            door.door_button.toggle()
+
+    def flash(self, door) -> bool:
+        """Turns the light on and off again. Returns whether anything was standing there."""
+        if not self.in_office or door.light_button.active:
+            return door.occupied()
+        door.light_button.toggle()
+        occupied = door.occupied()
+        door.light_button.toggle()
+        return occupied
+
+
+class Cautious(Policy):
+    """
+    Checks both lights every few seconds and keeps a door shut while something stands at it,
+    shuts the Knight's door when he is heard running and checks on Lefty's camera now and then to hold him.
+    """
+    CHECK_EVERY = 3000
+    CAMERA_EVERY = 12000
+    CAMERA_FOR = 2500
+
+    def __init__(self, game, dispatch, rng):
+        super().__init__(game, dispatch, rng)
+        self.next_check = 0
+        self.next_camera = self.CAMERA_EVERY
+        self.camera_until = None
+        self.knight = game.animatronics[3]
+        self.lefty = game.animatronics[2]
+
+    def act(self, now):
+        if self.camera_until is not None:
+            if now >= self.camera_until:
+                self.look_away()
+                self.camera_until = None
+            return
+        if self.knight.running:
+            self.set_door(self.knight.door, True)
+        if now >= self.next_check:
+            self.next_check = now + self.CHECK_EVERY
+            for door in self.game.office.doors:
+                held = self.knight.running and door is self.knight.door
+                self.set_door(door, self.flash(door) or held)
+        if now >= self.next_camera and self.in_office:
+            self.next_camera = now + self.CAMERA_EVERY
+            self.camera_until = now + self.CAMERA_FOR
+            self.watch(self.cameras.camera_list.index(self.lefty.camera))
+
+
+class RandomPlayer(Policy):
+    """Every second or so does something at random: a door, a light or a look at a random camera."""
+    def __init__(self, game, dispatch, rng):
+        super().__init__(game, dispatch, rng)
+        self.next_move = 0
+
+    def act(self, now):
+        if now < self.next_move:
+            return
+        self.next_move = now + self.rng.randint(500, 1500)
+        choice = self.rng.random()
+        if not self.game.office.active:
+            if choice < .5:
+                self.look_away()
+            return
+        door = self.rng.choice(self.game.office.doors)
+        if choice < .3:
+            self.set_door(door, door.door_status == 'open')
+        elif choice < .7:
+            self.flash(door)
+        elif choice < .85:
+            self.watch(self.rng.randrange(len(self.cameras.camera_list)))
+
+
+POLICIES = {'cautious': Cautious, 'random': RandomPlayer, 'idle': Policy}
+
+_game = None
+
+
+def _start_worker(nights_file: str) -> None:
+    """Builds the game once per worker process."""
+    global _game
+    import gameplay
+    pygame.init()
+    pygame.mixer.init()
+    gameplay.resolution.open(1, 0)
+    _game = gameplay.Game()
+    _game.save_manager = MemorySave()
+    with open(nights_file, 'r') as f:
+        _game.night_dict = json.load(f)
+
+
+def run_night(night: int, seed: int, policy: str = 'cautious', step: int = 50) -> dict:
+    """Plays one night to its end in the worker's game and returns what happened."""
+    from gameplay import VirtualClock, scheduler
+    game = _game
+    random.seed(seed)
+    scheduler.clock = VirtualClock()
+    scheduler.clear()
+    pygame.event.clear()
+    names = {id(animatronic.jumpscare): animatronic.name for animatronic in game.animatronics}
+    result = {'night': night, 'seed': seed, 'survived': False, 'cause': None, 'end': None, 'power_out': None,
+              'moves': [0] * HOURS, 'at_door': [0.0] * HOURS, 'power': [0] * HOURS}
+
+    def record(event):
+        if event.type == KILL and game.status == 'playing' and result['cause'] is None:
+            result['cause'] = 'power out' if game.power_out_stage > 0 else names.get(id(event.animation), 'unknown')
+        elif event.type == POWER_OUT and game.power_out_stage == 0 and result['power_out'] is None:
+            result['power_out'] = scheduler.now()
+
+    def dispatch(event):
+        record(event)
+        game.global_tick(event)
+        # Whatever the handlers posted is handled before the clock moves on
+        for queued in pygame.event.get():
+            record(queued)
+            game.global_tick(queued)
+
+    game.save_manager.data['night'] = night
+    game.start()
+    player = POLICIES[policy](game, dispatch, random.Random(seed))
+    locations = [animatronic._location for animatronic in game.animatronics]
+    power = game.power_manager.percentage
+    limit = (HOURS + 1) * game.clock.HOUR_DURATION * 1000
+    while game.status == 'playing' and scheduler.now() < limit:
+        scheduler.advance(step, dispatch)
+        game.update()
+        player.act(scheduler.now())
+        if game.status != 'playing':
+            break
+        hour = min(game.clock.hour, HOURS - 1)
+        for i, animatronic in enumerate(game.animatronics):
+            if animatronic._location != locations[i]:
+                locations[i] = animatronic._location
+                result['moves'][hour] += 1
+            if animatronic._location == animatronic.OFFICE_LOCATION:
+                result['at_door'][hour] += step / 1000
+        result['power'][hour] += power - game.power_manager.percentage
+        power = game.power_manager.percentage
+    result['survived'] = game.status == 'win'
+    result['end'] = scheduler.now()
+    if game.status == 'playing':
+        game.stop()
+    return result
+
+
+def run_batch(night: int, seeds: list[int], policy: str, step: int) -> list[dict]:
+    return [run_night(night, seed, policy, step) for seed in seeds]
+
+
+def simulate(nights: list[int], runs: int, policy: str = 'cautious', workers: int = None, seed: int = 0,
+             step: int = 50, nights_file: str = 'data/game/nights.json', batch: int = 20) -> list[dict]:
+    results = []
+    with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(nights_file,)) as pool:
+        futures = []
+        for night in nights:
+            seeds = [seed + i for i in range(runs)]
+            for i in range(0, runs, batch):
+                futures.append(pool.submit(run_batch, night, seeds[i:i + batch], policy, step))
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+def report(results: list[dict]) -> str:
+    lines = []
+    for night in sorted({result['night'] for result in results}):
+        runs = [result for result in results if result['night'] == night]
+        survived = sum(result['survived'] for result in runs)
+        lines.append(f"Night {night}: {len(runs)} runs, survived {survived / len(runs):.1%}")
+        causes = {}
+        for result in runs:
+            if result['cause'] is not None:
+                causes[result['cause']] = causes.get(result['cause'], 0) + 1
+        if causes:
+            lines.append("  deaths     " + '  '.join(f"{cause} {count / len(runs):.1%}" for cause, count in
+                                                   sorted(causes.items(), key=lambda item: item[1], reverse=True)))
+        outs = sorted(result['power_out'] for result in runs if result['power_out'] is not None)
+        if outs:
+            lines.append(f"  power out  {len(outs) / len(runs):.1%} of runs, median {clock_time(statistics.median(outs))}"
+                         f" (earliest {clock_time(outs[0])})")
+        lines.append("  hour       " + ''.join(f"{name:>9}" for name in HOUR_NAMES))
+        for key, label, form in (('moves', 'moves', '{:9.1f}'), ('at_door', 'at door s', '{:9.1f}'),
+                                 ('power', 'power %', '{:9.1f}')):
+            means = [statistics.fmean(result[key][hour] for result in runs) for hour in range(HOURS)]
+            lines.append(f"  {label:<11}" + ''.join(form.format(mean) for mean in means))
+    return '\n'.join(lines)
+
+
+def main():
+    nights = [1, 2, 3, 4, 5]
+    runs = 100
+    policy = 'cautious'
+    workers = None
+    seed = 0
+    step = 50
+    nights_file = 'data/game/nights.json'
+    output = None
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition('=')
+        if name == '--nights':
+            nights = [int(night) for night in value.split(',')]
+        elif name == '--runs':
+            runs = int(value)
+        elif name == '--policy':
+            policy = value
+        elif name == '--workers':
+            workers = int(value)
+        elif name == '--seed':
+            seed = int(value)
+        elif name == '--step':
+            step = int(value)
+        elif name == '--nights-file':
+            nights_file = value
+        elif name == '--json':
+            output = value
+        else:
+            sys.exit(f"Unknown option {arg}, see the top of simulate.py")
+    if policy not in POLICIES:
+        sys.exit(f"Unknown policy {policy}, pick one of {', '.join(POLICIES)}")
+
+    start = time.perf_counter()
+    results = simulate(nights, runs, policy, workers, seed, step, nights_file)
+    print(report(results))
+    print(f"{len(results)} nights in {time.perf_counter() - start:.1f}s")
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(results, f)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import unittest
+from types import SimpleNamespace
+
+from gameplay.bus import EventBus
+
+TICK = 1
+TOCK = 2
+
+
+class EventBusTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.calls = []
+
+    def handler(self, name: str):
+        return lambda event: self.calls.append((name, event.type))
+
+    def test_handlers_run_in_subscription_order(self):
+        self.bus.subscribe(TICK, self.handler('first'))
+        self.bus.subscribe((TICK, TOCK), self.handler('second'))
+        self.bus.subscribe(TICK, self.handler('third'))
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        self.bus.dispatch(SimpleNamespace(type=TOCK))
+        self.assertEqual(self.calls, [('first', TICK), ('second', TICK), ('third', TICK), ('second', TOCK)])
+
+    def test_only_subscribed_types(self):
+        self.bus.subscribe(TICK, self.handler('tick'))
+        self.bus.dispatch(SimpleNamespace(type=TOCK))
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.bus.counts[TOCK], 1)
+
+    def test_subscribing_during_dispatch_waits_for_the_next_one(self):
+        def subscribe(event):
+            self.bus.subscribe(TICK, self.handler('late'))
+        self.bus.subscribe(TICK, subscribe)
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        self.assertEqual(self.calls, [])
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        self.assertEqual(self.calls, [('late', TICK)])
+
+    def test_when_guard(self):
+        state = {'on': False}
+        self.bus.subscribe(TICK, self.handler('guarded'), when=lambda: state['on'])
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        state['on'] = True
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        self.assertEqual(self.calls, [('guarded', TICK)])
+        self.assertEqual(self.bus.counts[TICK], 2)
+
+    def test_unsubscribe_guarded_handler(self):
+        guarded = self.handler('guarded')
+        plain = self.handler('plain')
+        self.bus.subscribe((TICK, TOCK), guarded, when=lambda: True)
+        self.bus.subscribe(TICK, plain)
+        self.bus.unsubscribe((TICK, TOCK), guarded)
+        self.bus.dispatch(SimpleNamespace(type=TICK))
+        self.bus.dispatch(SimpleNamespace(type=TOCK))
+        self.assertEqual(self.calls, [('plain', TICK)])
+        self.assertEqual(self.bus.handlers(TOCK), ())
+
+    def test_report(self):
+        self.bus.subscribe(TICK, self.handler('tick'))
+        for event_type in (TICK, TICK, TOCK):
+            self.bus.dispatch(SimpleNamespace(type=event_type))
+        self.assertEqual(self.bus.report({TICK: 'TICK'}).splitlines(),
+                         ["Dispatched 3 events", "         2  TICK (1 handlers)", "         1  2 (0 handlers)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+
+import pygame
+
+from gameplay.audio import Mixer, LOW, NORMAL, HIGH, CRITICAL
+
+
+class FakeChannel:
+    """Stands in for pygame.mixer.Channel, busy from play() until stop()."""
+    def __init__(self):
+        self.sound = None
+        self.volumes = []
+
+    def get_busy(self) -> bool:
+        return self.sound is not None
+
+    def play(self, sound, loops=0, maxtime=0, fade_ms=0):
+        self.sound = sound
+
+    def stop(self):
+        self.sound = None
+
+    def set_volume(self, value):
+        self.volumes.append(value)
+
+
+class MixerTest(unittest.TestCase):
+    CHANNELS = 3
+
+    def setUp(self):
+        patcher = mock.patch.object(pygame.mixer, 'get_num_channels', return_value=self.CHANNELS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mixer = Mixer()
+        self.fakes = [FakeChannel() for _ in range(self.CHANNELS)]
+        self.mixer._channels = self.fakes
+        self.mixer._voices = [None] * self.CHANNELS
+
+    def test_free_channels_first(self):
+        for name in ('a', 'b', 'c'):
+            self.mixer.play(name, priority=HIGH)
+        self.assertEqual([fake.sound for fake in self.fakes], ['a', 'b', 'c'])
+        self.assertEqual(self.mixer.stolen, 0)
+
+    def test_takes_the_lowest_priority_then_the_oldest(self):
+        self.mixer.play('normal', priority=NORMAL)
+        self.mixer.play('old low', priority=LOW)
+        self.mixer.play('new low', priority=LOW)
+        channel = self.mixer.play('high', priority=HIGH)
+        self.assertIs(channel, self.fakes[1])
+        self.assertEqual([fake.sound for fake in self.fakes], ['normal', 'high', 'new low'])
+        self.mixer.play('critical', priority=CRITICAL)
+        self.assertEqual([fake.sound for fake in self.fakes], ['normal', 'high', 'critical'])
+        self.assertEqual(self.mixer.stolen, 2)
+
+    def test_never_takes_equal_or_higher_priority(self):
+        for name in ('a', 'b', 'c'):
+            self.mixer.play(name, priority=NORMAL)
+        self.assertIsNone(self.mixer.play('d', priority=NORMAL))
+        self.assertEqual(self.mixer.dropped, 1)
+
+    def test_never_takes_critical(self):
+        for name in ('a', 'b', 'c'):
+            self.mixer.play(name, priority=CRITICAL)
+        self.assertIsNone(self.mixer.play('d', priority=CRITICAL))
+
+    def test_leaves_channels_it_did_not_start(self):
+        self.fakes[0].play('outside')
+        self.mixer.play('a', priority=LOW)
+        self.mixer.play('b', priority=LOW)
+        self.mixer.play('c', priority=HIGH)
+        self.assertEqual(self.fakes[0].sound, 'outside')
+
+    def test_channel_starts_at_its_bus_level(self):
+        self.mixer.set_volume('master', .5)
+        self.mixer.set_volume('voice', .5)
+        self.mixer.play('call', 'voice')
+        self.assertEqual(self.fakes[0].volumes, [.25])
+
+    def test_set_volume_only_applies_changes(self):
+        self.mixer.play('a', 'sfx')
+        self.mixer.set_volume('sfx', .5)
+        self.mixer.set_volume('sfx', .5)
+        self.mixer.set_volume('master', 1)
+        self.assertEqual(self.fakes[0].volumes, [1, .5])
+
+    def test_set_duck_only_applies_changes(self):
+        self.mixer.play('drone', 'ambience')
+        self.mixer.play('light', 'sfx')
+        for _ in range(3):
+            self.mixer.set_duck('ambience', Mixer.DUCK)
+        self.mixer.set_duck('ambience', 1)
+        self.assertEqual(self.fakes[0].volumes, [1, Mixer.DUCK, 1])
+        self.assertEqual(self.fakes[1].volumes, [1])
+
+    def test_stopped_channels_are_not_touched(self):
+        self.mixer.play('a', 'sfx')
+        self.fakes[0].stop()
+        self.mixer.set_volume('sfx', .5)
+        self.assertEqual(self.fakes[0].volumes, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import pygame
+
+from gameplay.scheduler import Scheduler, PausableClock, VirtualClock
+
+TICK = pygame.USEREVENT + 40
+TOCK = pygame.USEREVENT + 41
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.scheduler = Scheduler(self.clock)
+        self.fired = []
+
+    def dispatch(self, event):
+        self.fired.append((self.clock.now(), event.type))
+
+    def test_fires_in_due_order(self):
+        self.scheduler.set_timer(TOCK, 300, 1)
+        self.scheduler.set_timer(TICK, 100, 1)
+        self.scheduler.advance(1000, self.dispatch)
+        self.assertEqual(self.fired, [(100, TICK), (300, TOCK)])
+
+    def test_ties_fire_in_the_order_they_were_set(self):
+        order = []
+        self.scheduler.call_later(100, lambda: order.append('first'))
+        self.scheduler.call_later(100, lambda: order.append('second'))
+        self.scheduler.advance(100)
+        self.assertEqual(order, ['first', 'second'])
+
+    def test_loops(self):
+        self.scheduler.set_timer(TICK, 100, 3)
+        self.scheduler.advance(1000, self.dispatch)
+        self.assertEqual(self.fired, [(100, TICK), (200, TICK), (300, TICK)])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_repeats_forever_without_drifting(self):
+        self.scheduler.set_timer(TICK, 100)
+        self.clock.advance(350)
+        self.assertEqual(self.scheduler.update(self.dispatch), 3)
+        self.assertEqual(self.scheduler.due(TICK), 400)
+
+    def test_setting_again_replaces(self):
+        self.scheduler.set_timer(TICK, 100, 1)
+        self.scheduler.set_timer(TICK, 500, 1)
+        self.scheduler.advance(1000, self.dispatch)
+        self.assertEqual(self.fired, [(500, TICK)])
+
+    def test_cancel(self):
+        self.scheduler.set_timer(TICK, 100)
+        self.scheduler.set_timer(TOCK, 200, 1)
+        self.scheduler.set_timer(TICK, 0)
+        self.scheduler.advance(1000, self.dispatch)
+        self.assertEqual(self.fired, [(200, TOCK)])
+        self.assertIsNone(self.scheduler.due(TICK))
+
+    def test_heap_is_compacted_after_many_cancels(self):
+        for _ in range(100):
+            self.scheduler.set_timer(TICK, 100)
+        self.assertLess(len(self.scheduler._heap), 100)
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_advance_counts_timers_set_while_firing_from_when_they_fired(self):
+        def chain():
+            self.fired.append(self.clock.now())
+            if len(self.fired) < 3:
+                self.scheduler.call_later(150, chain)
+        self.scheduler.call_later(100, chain)
+        self.assertEqual(self.scheduler.advance(1000), 3)
+        self.assertEqual(self.fired, [100, 250, 400])
+        self.assertEqual(self.clock.now(), 1000)
+
+    def test_advance_needs_a_virtual_clock(self):
+        scheduler = Scheduler(PausableClock(VirtualClock()))
+        with self.assertRaises(TypeError):
+            scheduler.advance(100)
+
+    def test_pause_holds_timers(self):
+        source = VirtualClock()
+        scheduler = Scheduler(PausableClock(source))
+        scheduler.set_timer(TICK, 100, 1)
+        scheduler.pause()
+        source.advance(500)
+        self.assertEqual(scheduler.update(self.dispatch), 0)
+        scheduler.resume()
+        source.advance(99)
+        self.assertEqual(scheduler.update(self.dispatch), 0)
+        source.advance(1)
+        self.assertEqual(scheduler.update(self.dispatch), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()